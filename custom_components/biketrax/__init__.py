@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from asyncio import Event
+import logging
+import time
+from asyncio import Event, Semaphore, gather
+from functools import partial
+from typing import Any
 
 from aiobiketrax import Account, Device
 from homeassistant.config_entries import ConfigEntry
@@ -12,18 +16,51 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA_DEVICE, DATA_SUBSCRIPTION, DATA_TRIP, DOMAIN
+from .auth import TokenStore
+from .capture import TrafficRecorder
+from .const import (
+    CAPTURE_FILE,
+    CONF_CAPTURE,
+    CONF_CONCURRENCY,
+    CONF_FAST_STARTUP,
+    DATA_DEVICE,
+    DATA_SETUP_DURATION,
+    DATA_SUBSCRIPTION,
+    DATA_TRIP,
+    DEFAULT_CONCURRENCY,
+    DOMAIN,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_KEY_TOKEN,
+    STORAGE_KEY_TRIPS,
+    STORAGE_VERSION,
+)
 from .coordinator import (
     BikeTraxDataUpdateCoordinator,
     DeviceDataUpdateCoordinator,
+    PushHealth,
     SubscriptionDataUpdateCoordinator,
     TripDataUpdateCoordinator,
 )
+from .latency import STAGE_WRITE
+from .metrics import ApiMetrics
+from .ratelimit import RateLimiter
+from .registry import SharedAccount, account_key, async_get_registry
+from .retry import RetryPolicy
+from .snapshot import (
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VERSION,
+    create_snapshot,
+    restore_snapshot,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [
     Platform.ALARM_CONTROL_PANEL,
@@ -37,54 +74,279 @@ PLATFORMS = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up BikeTrax from a config entry."""
 
-    # Setup an BikeTrax account instance.
-    account = Account(
-        entry.data[CONF_USERNAME],
-        entry.data[CONF_PASSWORD],
-        aiohttp_client.async_get_clientsession(hass),
+    start = time.monotonic()
+
+    # Config entries with the same credentials share the account, the
+    # coordinators and the websocket connection.
+    shared = await async_get_registry(hass).async_acquire(
+        entry, partial(_async_setup_account, hass)
     )
 
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = dict(shared.coordinators)
+
+    # Set up all platforms.
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await async_get_registry(hass).async_release(entry)
+        raise
+
+    setup_duration = time.monotonic() - start
+
+    hass.data[DOMAIN][entry.entry_id][DATA_SETUP_DURATION] = setup_duration
+
+    _LOGGER.debug(
+        "Setup of '%s' completed in %.3f seconds.", entry.title, setup_duration
+    )
+
+    return True
+
+
+async def _async_setup_account(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> SharedAccount:
+    """Set up the account and coordinators of a config entry."""
+
+    # Setup an BikeTrax account instance. The account has a dedicated HTTP
+    # session, so all its requests are counted and pass the rate limiter of
+    # the account.
+    rate_limiter = RateLimiter()
+    api_metrics = ApiMetrics()
+    push_health = PushHealth()
+    trace_configs = [
+        api_metrics.trace_config(),
+        rate_limiter.trace_config(),
+        push_health.trace_config(),
+    ]
+
+    # If enabled, all traffic of the account is captured, so it can be
+    # replayed offline.
+    recorder = None
+
+    if entry.options.get(CONF_CAPTURE, False):
+        recorder = TrafficRecorder(
+            hass, hass.config.path(CAPTURE_FILE.format(entry_id=entry.entry_id))
+        )
+        trace_configs.append(recorder.trace_config())
+
+    # The session is detached when the account is released, which may be after
+    # this config entry is unloaded.
+    session = aiohttp_client.async_create_clientsession(
+        hass, auto_cleanup=False, trace_configs=trace_configs
+    )
+    account = Account(entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD], session)
+
+    # Take over the login and the devices from the config flow, if the
+    # account was just validated. Otherwise, try to reuse the persisted login
+    # token. The account logs in again if the token is rejected.
+    token_store = TokenStore(hass, entry)
+    validated = async_get_registry(hass).async_pop_validated(entry)
+
+    if validated is not None:
+        account.identity_api.id_token = validated.identity_api.id_token
+        account._devices = validated._devices
+
+        token_store.async_save(account)
+    else:
+        await token_store.async_restore(account)
+
+    token_store.async_attach(account)
+    rate_limiter.attach_login(account)
+
     # Set up data coordinators per account/config entry. There are three
     # coordinators: one for the (push-capable) devices, one for the trips and
     # one for the subscription information. The last two will be updates less
-    # frequently.
+    # frequently. All coordinators share the same limit of concurrent requests
+    # and the same retry and rate limiting policies.
+    semaphore = Semaphore(entry.options.get(CONF_CONCURRENCY, DEFAULT_CONCURRENCY))
+    retry_policy = RetryPolicy()
+
     device_coordinator = DeviceDataUpdateCoordinator(
         hass,
         account,
         entry,
+        semaphore,
+        retry_policy,
+        rate_limiter,
+        token_store,
+        api_metrics,
+        push_health,
     )
     trip_coordinator = TripDataUpdateCoordinator(
         hass,
         account,
         entry,
+        semaphore,
+        retry_policy,
+        rate_limiter,
     )
     subscription_coordinator = SubscriptionDataUpdateCoordinator(
         hass,
         account,
         entry,
+        semaphore,
+        retry_policy,
+        rate_limiter,
     )
 
-    await device_coordinator.async_config_entry_first_refresh()
-    await trip_coordinator.async_config_entry_first_refresh()
-    await subscription_coordinator.async_config_entry_first_refresh()
+    async def _deferred_refresh(
+        coordinators: list[BikeTraxDataUpdateCoordinator],
+    ) -> None:
+        deferred_start = time.monotonic()
+
+        await gather(*(coordinator.async_refresh() for coordinator in coordinators))
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        DATA_DEVICE: device_coordinator,
-        DATA_TRIP: trip_coordinator,
-        DATA_SUBSCRIPTION: subscription_coordinator,
-    }
+        _LOGGER.debug(
+            "Deferred refresh of '%s' completed in %.3f seconds.",
+            entry.title,
+            time.monotonic() - deferred_start,
+        )
+
+    # The trip and subscription coordinators update per device, so they wait
+    # for the device list before refreshing. The positions, trips and
+    # subscriptions are then retrieved concurrently.
+    async def _first_refresh(coordinator: BikeTraxDataUpdateCoordinator) -> None:
+        await device_coordinator.async_wait_devices()
+        await coordinator.async_first_refresh()
+
+    shared = SharedAccount(
+        account,
+        session,
+        {
+            DATA_DEVICE: device_coordinator,
+            DATA_TRIP: trip_coordinator,
+            DATA_SUBSCRIPTION: subscription_coordinator,
+        },
+    )
+
+    # The deferred refresh is not tied to this config entry either, since
+    # other config entries may share the account.
+    @callback
+    def _refresh_in_background(
+        coordinators: list[BikeTraxDataUpdateCoordinator],
+    ) -> None:
+        task = hass.async_create_background_task(
+            _deferred_refresh(coordinators),
+            f"{DOMAIN}-{entry.entry_id}-deferred-refresh",
+        )
+        shared.async_on_release(task.cancel)
+
+    # Restore the last known state from the snapshot, if available. All
+    # coordinators are then refreshed in the background, and the entities
+    # remain available while the data is stale.
+    snapshot_store: Store[dict[str, Any]] = Store(
+        hass,
+        STORAGE_VERSION,
+        STORAGE_KEY_SNAPSHOT.format(account=account_key(entry.data[CONF_USERNAME])),
+    )
+
+    if validated is not None:
+        device_coordinator.async_set_prefetched()
+
+    try:
+        if validated is None and await _async_restore_snapshot(account, snapshot_store):
+            for coordinator in (
+                device_coordinator,
+                trip_coordinator,
+                subscription_coordinator,
+            ):
+                coordinator.async_set_stale()
+
+            _refresh_in_background(
+                [device_coordinator, trip_coordinator, subscription_coordinator]
+            )
+        elif entry.options.get(CONF_FAST_STARTUP, False):
+            # Only wait for the device data. The trips and subscriptions are
+            # refreshed in the background, and their entities will fill in
+            # once that completes.
+            await device_coordinator.async_first_refresh()
+
+            _refresh_in_background([trip_coordinator, subscription_coordinator])
+        else:
+            # All refreshes are awaited, even if one fails, so none of them
+            # keeps running after the setup failed.
+            results = await gather(
+                device_coordinator.async_first_refresh(),
+                _first_refresh(trip_coordinator),
+                _first_refresh(subscription_coordinator),
+                return_exceptions=True,
+            )
+
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+    except Exception:
+        # The setup is retried with a new account and session.
+        await shared.async_shutdown()
+        raise
+
+    # Persist a new snapshot whenever the device or subscription data changes.
+    @callback
+    def _save_snapshot() -> None:
+        if not device_coordinator.stale:
+            snapshot_store.async_delay_save(
+                lambda: create_snapshot(account), SNAPSHOT_SAVE_DELAY
+            )
+
+    # The listeners outlive this config entry if other config entries share
+    # the account, so they are tied to the shared account instead.
+    shared.async_on_release(device_coordinator.async_add_listener(_save_snapshot))
+    shared.async_on_release(subscription_coordinator.async_add_listener(_save_snapshot))
+
+    # Update the subscriptions on demand when the device data shows that a
+    # subscription expired, since it may have been renewed already.
+    @callback
+    def _check_subscriptions() -> None:
+        subscription_coordinator.async_check_expired(
+            device_coordinator.expired_subscriptions
+        )
+
+    shared.async_on_release(device_coordinator.async_add_listener(_check_subscriptions))
+
+    if recorder is not None:
+        recorder.async_attach(account)
+        recorder.async_start()
+
+        shared.async_on_release(recorder.async_stop)
 
     # Start the websocket background task.
     device_coordinator.start_background_task()
 
     async def _stop(event: Event) -> None:
-        await device_coordinator.stop_background_task()
+        await shared.async_stop()
 
-    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _stop))
+        if recorder is not None:
+            await recorder.async_flush()
+
+    shared.async_on_release(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _stop))
+
+    return shared
 
-    # Set up all platforms.
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+async def _async_restore_snapshot(
+    account: Account, store: Store[dict[str, Any]]
+) -> bool:
+    """Restore the account data from a snapshot, if available."""
+    if not (snapshot := await store.async_load()):
+        return False
+
+    try:
+        # Snapshots of other versions may have a different format.
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            _LOGGER.debug("Ignoring snapshot of version %s.", snapshot.get("version"))
+            return False
+
+        if not snapshot["devices"]:
+            return False
+
+        restore_snapshot(account, snapshot)
+    except (AttributeError, AssertionError, KeyError, TypeError, ValueError) as e:
+        _LOGGER.warning("Unable to restore snapshot, ignoring it.", exc_info=e)
+        return False
+
+    _LOGGER.debug("Restored %d device(s) from snapshot.", len(account.devices))
 
     return True
 
@@ -92,14 +354,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinators = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id)
 
-        # Stop the websocket background task.
-        await coordinators[DATA_DEVICE].stop_background_task()
+        # Stops the websocket background task, unless the account is still
+        # used by another config entry.
+        await async_get_registry(hass).async_release(entry)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry.
+
+    The data is kept if another config entry still uses the same account.
+    """
+    username = entry.data[CONF_USERNAME].lower()
+
+    if any(
+        other.entry_id != entry.entry_id
+        and other.data[CONF_USERNAME].lower() == username
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        return
+
+    for key in (STORAGE_KEY_SNAPSHOT, STORAGE_KEY_TOKEN, STORAGE_KEY_TRIPS):
+        await Store(
+            hass, STORAGE_VERSION, key.format(account=account_key(username))
+        ).async_remove()
+
+
 class BikeTraxBaseEntity(CoordinatorEntity[BikeTraxDataUpdateCoordinator]):
     """Common base for BikeTrax entities."""
 
@@ -111,10 +394,13 @@ class BikeTraxBaseEntity(CoordinatorEntity[BikeTraxDataUpdateCoordinator]):
         device: Device,
     ) -> None:
         """Initialize entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.id)
 
         self.device = device
 
+        self._available: bool | None = None
+        self._fingerprint: tuple | None = None
+
         self._attr_device_info = DeviceInfo(
             configuration_url="https://app.powunity.com/",
             identifiers={(DOMAIN, str(self.device.id))},
@@ -129,3 +415,88 @@ class BikeTraxBaseEntity(CoordinatorEntity[BikeTraxDataUpdateCoordinator]):
         """When entity is added to hass."""
         await super().async_added_to_hass()
         self._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available.
+
+        Entities restored from a snapshot remain available until the first
+        live update of the coordinator completed, even if it failed.
+        """
+        return super().available or self.coordinator.stale
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        The state is only written if the update affected the device of this
+        entity, or if the availability of the entity changed. Even then, the
+        write is skipped if the state and attributes are identical to the last
+        written ones.
+        """
+        available = self.available
+
+        if available == self._available and self.device.id not in (
+            self.coordinator.data or ()
+        ):
+            return
+
+        self._available = available
+
+        if self._state_fingerprint() == self._fingerprint:
+            self.coordinator.suppressed_writes += 1
+            return
+
+        super()._handle_coordinator_update()
+
+        # Measure how long it took for new device data to reach the state.
+        path = self.coordinator.update_path
+
+        if path is not None and self.device.id in (self.coordinator.data or ()):
+            self.coordinator.latency.record(STAGE_WRITE, path, self.device.last_updated)
+
+    def _state_fingerprint(self) -> tuple:
+        """Return a fingerprint of the state and attributes to write."""
+        return (
+            self.available,
+            self.state,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine.
+
+        The fingerprint of the written state is kept for all writes, including
+        those that do not originate from a coordinator update (e.g. when the
+        entity is added, or after a command).
+        """
+        self.coordinator.state_writes += 1
+
+        super().async_write_ha_state()
+
+        self._fingerprint = self._state_fingerprint()
+
+
+class BikeTraxAccountEntity(CoordinatorEntity[DeviceDataUpdateCoordinator]):
+    """Common base for BikeTrax entities that describe the account."""
+
+    coordinator: DeviceDataUpdateCoordinator
+
+    def __init__(
+        self,
+        coordinator: DeviceDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize entity."""
+        super().__init__(coordinator)
+
+        self._attr_device_info = DeviceInfo(
+            configuration_url="https://app.powunity.com/",
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, entry.entry_id)},
+            manufacturer="PowUnity",
+            model="BikeTrax account",
+            name=entry.title,
+        )
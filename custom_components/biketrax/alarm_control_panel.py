@@ -10,11 +10,12 @@ from homeassistant.components.alarm_control_panel.const import (
     AlarmControlPanelState,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import BikeTraxBaseEntity
-from .const import DATA_DEVICE, DOMAIN
+from .command import OptimisticCommand
+from .const import CONF_READ_ONLY, DATA_DEVICE, DOMAIN
 from .coordinator import BikeTraxDataUpdateCoordinator
 
 
@@ -28,8 +29,11 @@ async def async_setup_entry(
         config_entry.entry_id
     ][DATA_DEVICE]
 
+    # Read-only mode applies per config entry, even if the account is shared.
+    read_only = config_entry.options.get(CONF_READ_ONLY, False)
+
     entities: list[BikeTraxAlarmController] = [
-        BikeTraxAlarmController(coordinator, device)
+        BikeTraxAlarmController(coordinator, device, read_only)
         for device in coordinator.account.devices
     ]
 
@@ -54,29 +58,64 @@ class BikeTraxAlarmController(BikeTraxBaseEntity, AlarmControlPanelEntity):
         self,
         coordinator: BikeTraxDataUpdateCoordinator,
         device: Device,
+        read_only: bool,
     ) -> None:
         """Initialize the tracker."""
         super().__init__(coordinator, device)
 
+        self._read_only = read_only
+
         self.entity_id = f"{ALARM_DOMAIN}.{DOMAIN}_alarm_{device.id}"
 
         self._attr_name = f"{device.name} Alarm"
         self._attr_unique_id = f"{device.id}-alarm"
 
+        # Arming at home is not known to the device, so it is kept here, and
+        # restored to the last sent value on rollback.
         self._is_home = False
+        self._sent_home = False
+
+        self._command = OptimisticCommand(
+            coordinator,
+            self._async_set_guarded,
+            self.async_write_ha_state,
+            self._rollback,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """When entity will be removed from hass."""
+        await super().async_will_remove_from_hass()
+        self._command.async_shutdown()
+
+    async def _async_set_guarded(self, value: bool) -> None:
+        """Send the guarded state, and remember where it was armed."""
+        is_home = self._is_home
+        await self.device.set_guarded(value)
+        self._sent_home = is_home
+
+    @callback
+    def _rollback(self) -> None:
+        """Roll back to where it was armed by the last sent value."""
+        self._is_home = self._sent_home
 
     @property
     def state(self):
         """Return the state of the device."""
+        is_guarded = (
+            self.device.is_guarded
+            if self._command.desired is None
+            else self._command.desired
+        )
+
         return (
             AlarmControlPanelState.TRIGGERED
-            if self.device.is_guarded and self.device.is_alarm_triggered
+            if is_guarded and self.device.is_alarm_triggered
             else (
                 AlarmControlPanelState.ARMED_HOME
-                if self.device.is_guarded and self._is_home
+                if is_guarded and self._is_home
                 else (
                     AlarmControlPanelState.ARMED_AWAY
-                    if self.device.is_guarded
+                    if is_guarded
                     else AlarmControlPanelState.DISARMED
                 )
             )
@@ -84,25 +123,25 @@ class BikeTraxAlarmController(BikeTraxBaseEntity, AlarmControlPanelEntity):
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
-        if not self.coordinator.read_only:
+        if not self._read_only:
             self._is_home = False
-            await self.device.set_guarded(False)
+            await self._command.async_set(False)
 
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send arm away command."""
-        if not self.coordinator.read_only:
+        if not self._read_only:
             self._is_home = True
-            await self.device.set_guarded(True)
+            await self._command.async_set(True)
 
     async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send arm away command."""
-        if not self.coordinator.read_only:
+        if not self._read_only:
             self._is_home = False
-            await self.device.set_guarded(True)
+            await self._command.async_set(True)
 
     async def async_alarm_trigger(self, code: str | None = None) -> None:
         """Send alarm trigger command."""
-        if not self.coordinator.read_only:
+        if not self._read_only:
             # There is not really a possibility to trigger an alarm, so at
             # least enable it.
-            await self.device.set_guarded(True)
+            await self._command.async_set(True)
@@ -0,0 +1,95 @@
+"""Persistence of BikeTrax authentication tokens."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from aiobiketrax import Account
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import STORAGE_KEY_TOKEN, STORAGE_VERSION
+from .registry import account_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenStore:
+    """Persist the login token of an account.
+
+    The token is stored as is. It grants less access than the password, which
+    is stored in the config entry in the same storage directory. A persisted
+    token is reused at startup to skip the login. If the API rejects it, the
+    account logs in again and the new token is persisted.
+    """
+
+    reused: int
+    logins: int
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the token store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_TOKEN.format(account=account_key(entry.data[CONF_USERNAME])),
+        )
+
+        self.reused = 0
+        self.logins = 0
+
+    async def async_restore(self, account: Account) -> bool:
+        """Restore the persisted token of an account, if still valid."""
+        if not (data := await self._store.async_load()):
+            return False
+
+        id_token = data.get("id_token")
+
+        if not isinstance(id_token, dict):
+            _LOGGER.debug("Unable to read persisted token, logging in again.")
+            return False
+
+        if id_token.get("exp", 0) <= time.time():
+            _LOGGER.debug("Persisted token expired, ignoring it.")
+            return False
+
+        account.identity_api.id_token = id_token
+        self.reused += 1
+
+        _LOGGER.debug(
+            "Reusing persisted token for '%s'.", account.identity_api.username
+        )
+
+        return True
+
+    @callback
+    def async_attach(self, account: Account) -> None:
+        """Count the logins of an account, and persist the resulting tokens."""
+        identity_api = account.identity_api
+        login = identity_api.login
+
+        async def _login() -> None:
+            if identity_api.id_token is not None:
+                return
+
+            await login()
+
+            self.logins += 1
+            self.async_save(account)
+
+        identity_api.login = _login
+
+    @callback
+    def async_save(self, account: Account) -> None:
+        """Persist the current token of an account."""
+        if (id_token := account.identity_api.id_token) is None:
+            return
+
+        self._store.async_delay_save(lambda: {"id_token": id_token})
+
+    async def async_remove(self) -> None:
+        """Remove the persisted token."""
+        await self._store.async_remove()
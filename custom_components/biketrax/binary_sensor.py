@@ -2,22 +2,25 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import cast
 
 from aiobiketrax import Device
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import BikeTraxBaseEntity
+from . import BikeTraxAccountEntity, BikeTraxBaseEntity
 from .const import DATA_DEVICE, DOMAIN
-from .coordinator import BikeTraxDataUpdateCoordinator
+from .coordinator import BikeTraxDataUpdateCoordinator, DeviceDataUpdateCoordinator
 
 
 @dataclass
@@ -34,6 +37,20 @@ class BikeTraxBinarySensorEntityDescription(
     """Describes BikeTrax binary_sensor entity."""
 
 
+@dataclass
+class BikeTraxAccountRequiredKeysMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[DeviceDataUpdateCoordinator], bool]
+
+
+@dataclass
+class BikeTraxAccountBinarySensorEntityDescription(
+    BinarySensorEntityDescription, BikeTraxAccountRequiredKeysMixin
+):
+    """Describes BikeTrax account binary_sensor entity."""
+
+
 SENSOR_TYPES: tuple[BikeTraxBinarySensorEntityDescription, ...] = (
     BikeTraxBinarySensorEntityDescription(
         coordinator=DATA_DEVICE,
@@ -61,6 +78,16 @@ SENSOR_TYPES: tuple[BikeTraxBinarySensorEntityDescription, ...] = (
     ),
 )
 
+ACCOUNT_SENSOR_TYPES: tuple[BikeTraxAccountBinarySensorEntityDescription, ...] = (
+    BikeTraxAccountBinarySensorEntityDescription(
+        device_class=BinarySensorDeviceClass.CONNECTIVITY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        key="push_connected",
+        name="Push connected",
+        value_fn=lambda c: c.push_health.connected,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -73,12 +100,19 @@ async def async_setup_entry(
         config_entry.entry_id
     ]
 
-    entities = [
+    entities: list[BinarySensorEntity] = [
         BikeTraxBinarySensor(coordinators[description.coordinator], device, description)
         for description in SENSOR_TYPES
         for device in coordinators[description.coordinator].account.devices
     ]
 
+    entities.extend(
+        BikeTraxAccountBinarySensor(
+            coordinators[DATA_DEVICE], config_entry, description
+        )
+        for description in ACCOUNT_SENSOR_TYPES
+    )
+
     async_add_entities(entities)
 
 
@@ -108,3 +142,28 @@ class BikeTraxBinarySensor(BikeTraxBaseEntity, BinarySensorEntity):
     def is_on(self) -> bool:
         """Return True if the binary sensor is on."""
         return cast(bool, getattr(self.device, self.entity_description.key))
+
+
+class BikeTraxAccountBinarySensor(BikeTraxAccountEntity, BinarySensorEntity):
+    """Representation of a BikeTrax account binary sensor."""
+
+    entity_description: BikeTraxAccountBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DeviceDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: BikeTraxAccountBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize sensor."""
+        super().__init__(coordinator, entry)
+
+        self.entity_description = description
+
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}-{description.key}"
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if the binary sensor is on."""
+        return self.entity_description.value_fn(self.coordinator)
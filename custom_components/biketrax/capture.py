@@ -0,0 +1,261 @@
+"""Capture of the API and push traffic of a BikeTrax account.
+
+A capture records every API response and pushed update the integration
+receives, so a busy period can be replayed offline. Each line of a capture is
+a compact JSON array, in one of two forms:
+
+    [time, "api", key, status, body]
+    [time, "push", message]
+
+The time is in seconds since the epoch. The key identifies the request (see
+`request_key`), and the body is the decoded JSON response, or None. A pushed
+message has the same format as a websocket message of the API, with a single
+position or device.
+
+Sensitive data is redacted before it is recorded, see `TrafficRecorder`. Once
+a capture reaches its maximum size, it is rotated to a file with the suffix
+`.1`, replacing the previous one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from aiobiketrax import Account, models
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from yarl import URL
+
+from .const import TO_REDACT
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_API = "api"
+KIND_PUSH = "push"
+
+# Query parameters that differ between otherwise equivalent requests.
+_VOLATILE_PARAMS = {"from", "to", "id"}
+
+REDACTED = "**REDACTED**"
+
+# Keys of the data that is redacted from captures, in addition to the keys
+# that are redacted from diagnostics. The login and the session return tokens.
+_TO_REDACT = {
+    *TO_REDACT,
+    "access_token",
+    "address",
+    "email",
+    "id_token",
+    "login",
+    "refresh_token",
+    "token",
+}
+
+# Keys of the data that is replaced by a pseudonym instead, as it links the
+# devices to the requests of the admin API.
+_TO_PSEUDONYMIZE = {"uniqueId"}
+
+# Keys of coordinates that are shifted by a random offset instead, so the
+# movement of devices is kept but their whereabouts are not.
+_TO_SHIFT = {"latitude", "longitude"}
+
+
+def request_key(method: str, url: URL) -> str:
+    """Return the key of a request, without volatile query parameters."""
+    key = f"{method} {url.host}{url.path}"
+    query = "&".join(
+        f"{name}={value}"
+        for name, value in sorted(url.query.items())
+        if name not in _VOLATILE_PARAMS
+    )
+
+    return f"{key}?{query}" if query else key
+
+
+class TrafficRecorder:
+    """Record the API responses and pushed updates of an account to a file.
+
+    Records are buffered, and appended to the file periodically in the
+    executor, so the event loop is not blocked by file I/O.
+
+    Personal data and tokens are redacted, with the keys that are redacted
+    from diagnostics and more. Unique IDs are replaced by a pseudonym, and
+    coordinates are shifted by an offset that is random per recorder, so the
+    capture can still be replayed.
+    """
+
+    FLUSH_INTERVAL = timedelta(seconds=10)
+
+    # Size (in bytes) after which the file is rotated.
+    MAX_SIZE = 50 * 1024 * 1024
+
+    # Maximum offset (in degrees) of the coordinates.
+    MAX_OFFSET = 1.0
+
+    records: int
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = path
+        self.records = 0
+
+        self._buffer: list[str] = []
+        self._cancel_flush: CALLBACK_TYPE | None = None
+
+        self._offsets = {
+            key: random.uniform(-self.MAX_OFFSET, self.MAX_OFFSET) for key in _TO_SHIFT
+        }
+        self._pseudonyms: dict[str, str] = {}
+
+    def _pseudonym(self, value: str) -> str:
+        """Return the pseudonym of a unique ID, of the same length."""
+        if (pseudonym := self._pseudonyms.get(value)) is None:
+            digest = int(hashlib.sha256(value.encode()).hexdigest(), 16)
+            pseudonym = self._pseudonyms[value] = str(digest)[: len(value)]
+
+        return pseudonym
+
+    def _redact(self, data: Any) -> Any:
+        """Return a copy of the data, without sensitive data."""
+        if isinstance(data, list):
+            return [self._redact(item) for item in data]
+
+        if not isinstance(data, dict):
+            return data
+
+        redacted = {}
+
+        for key, value in data.items():
+            if value is None:
+                redacted[key] = None
+            elif key in _TO_PSEUDONYMIZE and isinstance(value, str):
+                redacted[key] = self._pseudonym(value)
+            elif key in _TO_SHIFT and isinstance(value, (int, float)):
+                redacted[key] = value + self._offsets[key]
+            elif key in _TO_REDACT:
+                redacted[key] = REDACTED
+            else:
+                redacted[key] = self._redact(value)
+
+        return redacted
+
+    def _redact_key(self, key: str) -> str:
+        """Return a request key, with the unique IDs replaced by pseudonyms."""
+        for value, pseudonym in self._pseudonyms.items():
+            key = key.replace(value, pseudonym)
+
+        return key
+
+    def _record(self, *record: Any) -> None:
+        """Buffer a record."""
+        self._buffer.append(
+            json.dumps([round(time.time(), 3), *record], separators=(",", ":"))
+        )
+        self.records += 1
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config that records all responses of a session."""
+
+        async def _on_request_end(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            response = params.response
+
+            # The websocket is recorded per message instead.
+            if response.status == 101:
+                return
+
+            body = None
+
+            # The body is cached by the response, so it can still be read by
+            # the API client.
+            if response.content_type == "application/json":
+                try:
+                    body = json.loads(await response.read())
+                except ValueError:
+                    pass
+
+            # The body is redacted first, so the unique IDs it contains are
+            # known when redacting the key.
+            body = self._redact(body)
+
+            self._record(
+                KIND_API,
+                self._redact_key(request_key(params.method, params.url)),
+                response.status,
+                body,
+            )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_end.append(_on_request_end)
+
+        return trace_config
+
+    @callback
+    def async_attach(self, account: Account) -> None:
+        """Record the pushed updates of an account."""
+        create_socket = account.traccar_api.create_socket
+
+        async def _create_socket() -> AsyncIterator[models.Position | models.Device]:
+            async for update in create_socket():
+                if isinstance(update, models.Position):
+                    message = {"positions": [update.to_dict()]}
+                else:
+                    message = {"devices": [update.to_dict()]}
+
+                self._record(KIND_PUSH, self._redact(message))
+
+                yield update
+
+        account.traccar_api.create_socket = _create_socket
+
+    @callback
+    def async_start(self) -> None:
+        """Start appending the records to the file periodically."""
+        _LOGGER.info("Capturing API traffic to '%s'.", self.path)
+
+        self._cancel_flush = async_track_time_interval(
+            self.hass, self.async_flush, self.FLUSH_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop capturing, and append the remaining records."""
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+        self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self, *args: Any) -> None:
+        """Append the buffered records to the file."""
+        if not self._buffer:
+            return
+
+        lines, self._buffer = self._buffer, []
+
+        await self.hass.async_add_executor_job(self._append, lines)
+
+    def _append(self, lines: list[str]) -> None:
+        """Append lines to the file, rotating it once it is too large."""
+        try:
+            if os.path.getsize(self.path) >= self.MAX_SIZE:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
@@ -0,0 +1,113 @@
+"""Optimistic, debounced commands for BikeTrax devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .coordinator import BikeTraxDataUpdateCoordinator
+from .ratelimit import PRIORITY_COMMAND, request_priority
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OptimisticCommand:
+    """Send the desired value of a device setting.
+
+    The desired value is shown right away, and sent after a short cooldown.
+    Changes within the cooldown are coalesced, so only the last desired value
+    is sent. If sending fails, the value is rolled back to the last known
+    value of the device, unless it changed again while sending.
+
+    The debouncer does not call again while a value is being sent, so a value
+    that changes while sending is sent by the same call, after another
+    cooldown.
+    """
+
+    # Time (in seconds) to wait for further changes before sending.
+    COOLDOWN = 1.0
+
+    desired: bool | None
+
+    def __init__(
+        self,
+        coordinator: BikeTraxDataUpdateCoordinator,
+        send_fn: Callable[[bool], Awaitable[None]],
+        on_change: CALLBACK_TYPE,
+        on_rollback: CALLBACK_TYPE | None = None,
+    ) -> None:
+        """Initialize the command."""
+        self.coordinator = coordinator
+        self.desired = None
+
+        self._send_fn = send_fn
+        self._on_change = on_change
+        self._on_rollback = on_rollback
+        self._pending = False
+        self._shutdown = False
+        self._debouncer = Debouncer(
+            coordinator.hass,
+            _LOGGER,
+            cooldown=self.COOLDOWN,
+            immediate=False,
+            function=self._async_send,
+        )
+
+    async def async_set(self, value: bool) -> None:
+        """Set the desired value, and send it after the cooldown."""
+        # Only a value that was not sent yet is coalesced. A value that is
+        # being sent is followed by another command.
+        if self._pending:
+            self.coordinator.commands_coalesced += 1
+
+        self.desired = value
+        self._pending = True
+        self._on_change()
+
+        await self._debouncer.async_call()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel sending a pending value."""
+        self._shutdown = True
+        self._debouncer.async_shutdown()
+
+    async def _async_send(self) -> None:
+        """Send the desired value, until it no longer changes while sending."""
+        while (value := self.desired) is not None:
+            self._pending = False
+            start = time.monotonic()
+
+            try:
+                with request_priority(PRIORITY_COMMAND):
+                    await self._send_fn(value)
+            except Exception as err:  # pylint: disable=broad-except
+                if self.desired == value:
+                    _LOGGER.error("Unable to send command, rolling back: %s", err)
+
+                    self.desired = None
+
+                    if self._on_rollback is not None:
+                        self._on_rollback()
+                else:
+                    _LOGGER.error(
+                        "Unable to send command, sending newer value: %s", err
+                    )
+            else:
+                self.coordinator.async_record_command(time.monotonic() - start)
+
+                if self.desired == value:
+                    self.desired = None
+
+            if self._shutdown:
+                return
+
+            self._on_change()
+
+            if self.desired is not None:
+                await asyncio.sleep(self.COOLDOWN)
@@ -12,7 +12,22 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import aiohttp_client
 
-from .const import CONF_READ_ONLY, DOMAIN
+from .const import (
+    CONF_CAPTURE,
+    CONF_COALESCE_WINDOW,
+    CONF_CONCURRENCY,
+    CONF_FAST_STARTUP,
+    CONF_IGNORE_JITTER,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_READ_ONLY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+)
+from .registry import async_get_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,9 +69,39 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     if not account.devices:
         raise NoDevice
 
+    # The setup of the config entry continues with this account, so it does
+    # not have to login and retrieve the devices again.
+    async_get_registry(hass).async_add_validated(account)
+
     return {"title": f"BikeTrax {data['username']}"}
 
 
+async def async_reload_account(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry
+) -> None:
+    """Reload a config entry, and the other entries of the same account.
+
+    Config entries with the same username share the coordinators of the
+    account, which are only recreated once all entries are unloaded. The
+    entry is set up first, so the account uses its options.
+    """
+    others = [
+        other
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+        and other.state is config_entries.ConfigEntryState.LOADED
+        and other.data["username"].lower() == entry.data["username"].lower()
+    ]
+
+    for other in others:
+        await hass.config_entries.async_unload(other.entry_id)
+
+    await hass.config_entries.async_reload(entry.entry_id)
+
+    for other in others:
+        await hass.config_entries.async_setup(other.entry_id)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for PowUnity BikeTrax."""
 
@@ -71,6 +116,17 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 step_id="user", data_schema=STEP_USER_DATA_SCHEMA
             )
 
+        # Config entries of the same account would share its coordinators and
+        # options, and the unique IDs of its entities would collide.
+        username = user_input["username"].lower()
+
+        await self.async_set_unique_id(username)
+        self._abort_if_unique_id_configured()
+
+        for entry in self._async_current_entries():
+            if entry.data["username"].lower() == username:
+                return self.async_abort(reason="already_configured")
+
         errors = {}
 
         try:
@@ -113,15 +169,22 @@ class BikeTraxOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
         """Handle the initial step."""
+        errors = {}
+
         if user_input is not None:
-            # Manually update & reload the config entry after options change.
-            changed = self.hass.config_entries.async_update_entry(
-                self.config_entry,
-                options=user_input,
-            )
-            if changed:
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            return self.async_create_entry(title="", data=user_input)
+            if user_input.get(
+                CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+            ) > user_input.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL):
+                errors["base"] = "invalid_scan_interval"
+            else:
+                # Manually update & reload the config entry after options change.
+                changed = self.hass.config_entries.async_update_entry(
+                    self.config_entry,
+                    options=user_input,
+                )
+                if changed:
+                    await async_reload_account(self.hass, self.config_entry)
+                return self.async_create_entry(title="", data=user_input)
         return self.async_show_form(
             step_id="account_options",
             data_schema=vol.Schema(
@@ -130,8 +193,47 @@ class BikeTraxOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_READ_ONLY,
                         default=self.config_entry.options.get(CONF_READ_ONLY, False),
                     ): bool,
+                    vol.Optional(
+                        CONF_CONCURRENCY,
+                        default=self.config_entry.options.get(
+                            CONF_CONCURRENCY, DEFAULT_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Optional(
+                        CONF_FAST_STARTUP,
+                        default=self.config_entry.options.get(CONF_FAST_STARTUP, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_COALESCE_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                    vol.Optional(
+                        CONF_IGNORE_JITTER,
+                        default=self.config_entry.options.get(
+                            CONF_IGNORE_JITTER, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CAPTURE,
+                        default=self.config_entry.options.get(CONF_CAPTURE, False),
+                    ): bool,
                 }
             ),
+            errors=errors,
         )
 
 
@@ -1,13 +1,43 @@
 """Constants for the PowUnity BikeTrax integration."""
 
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
 DATA_DEVICE = "device"
 DATA_TRIP = "trip"
 DATA_SUBSCRIPTION = "subscription"
+DATA_REGISTRY = "registry"
+DATA_SCHEDULER = "scheduler"
+DATA_SETUP_DURATION = "setup_duration"
 
 ATTR_ALTITUDE = "altitude"
 ATTR_COURSE = "course"
+ATTR_FIX_TIME = "fix_time"
 ATTR_SPEED = "speed"
 
+CONF_CAPTURE = "capture"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_CONCURRENCY = "concurrency"
+CONF_FAST_STARTUP = "fast_startup"
+CONF_IGNORE_JITTER = "ignore_jitter"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
 CONF_READ_ONLY = "read_only"
 
+DEFAULT_COALESCE_WINDOW = 250
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_SCAN_INTERVAL = 15
+DEFAULT_MIN_SCAN_INTERVAL = 2
+
 DOMAIN = "biketrax"
+
+CAPTURE_FILE = f"{DOMAIN}.{{entry_id}}.capture.jsonl"
+
+# Keys of personal data that is redacted from diagnostics and captures.
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "contact", "passport", "phone", "uniqueId"}
+
+# Persisted data belongs to an account, which may be shared by multiple config
+# entries (see `registry.account_key`).
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.{{account}}.snapshot"
+STORAGE_KEY_TOKEN = f"{DOMAIN}.{{account}}.token"
+STORAGE_KEY_TRIPS = f"{DOMAIN}.{{account}}.trips"
+STORAGE_VERSION = 1
@@ -2,16 +2,49 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
 
+import aiohttp
 import homeassistant.util.dt as dt_util
-from aiobiketrax import Account, exceptions
+from aiobiketrax import Account, Device, exceptions, models
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import CONF_READ_ONLY, DOMAIN
+from .auth import TokenStore
+from .const import (
+    CONF_COALESCE_WINDOW,
+    CONF_IGNORE_JITTER,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DOMAIN,
+    STORAGE_KEY_TRIPS,
+    STORAGE_VERSION,
+)
+from .latency import PATH_POLL, PATH_PUSH, STAGE_RECEIVE, LatencyTracker
+from .metrics import ApiMetrics, CoordinatorMetrics, RateCounter
+from .ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_DEVICE,
+    RateLimiter,
+    request_priority,
+)
+from .registry import account_key
+from .retry import STATE_CLOSED, RetryPolicy
+from .scheduler import async_get_scheduler
 
 SCAN_INTERVAL_DEVICE = timedelta(minutes=15)
 SCAN_INTERVAL_TRIPS = timedelta(hours=1)
@@ -20,130 +53,1077 @@ SCAN_INTERVAL_SUBSCRIPTION = timedelta(hours=12)
 _LOGGER = logging.getLogger(__name__)
 
 
-class BikeTraxDataUpdateCoordinator(DataUpdateCoordinator):
+def _fingerprint(device: Device) -> tuple:
+    """Return a fingerprint of all device data that entities depend on."""
+    return (
+        device.name,
+        device.status,
+        device.last_updated,
+        device.firmware_version,
+        device.is_guarded,
+        device.is_alarm_triggered,
+        device.is_auto_guarded,
+        device.is_stolen,
+        device.is_tracking_enabled,
+        device.guard_type,
+        device.geofence_radius,
+        device.device_time,
+        device.latitude,
+        device.longitude,
+        device.altitude,
+        device.accuracy,
+        device.speed,
+        device.course,
+        device.battery_level,
+        device.estimated_battery_level,
+        device.is_charging,
+        device.total_distance,
+    )
+
+
+class DevicePollScheduler:
+    """Determine when devices should be polled, based on their activity.
+
+    Devices that are moving or have a triggered alarm are polled at the
+    minimum interval. Other devices are polled less frequently the longer
+    they have not been updated, up to the maximum interval.
+    """
+
+    # Speed (in km/h) above which a device is considered moving. Lower speeds
+    # are usually GPS inaccuracies.
+    MOVING_SPEED = 2.0
+
+    # Fraction of the time since the last update of an idle device that is
+    # used as its poll interval.
+    IDLE_FACTOR = 0.25
+
+    min_interval: timedelta
+    max_interval: timedelta
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Initialize the scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+
+    def interval(self, device: Device, stretch: float = 1.0) -> timedelta:
+        """Return the poll interval of a device.
+
+        The interval of devices that are not alarmed is multiplied by
+        `stretch`, e.g. when updates are pushed reliably.
+        """
+        if device.is_alarm_triggered:
+            return self.min_interval
+
+        if (device.speed or 0.0) > self.MOVING_SPEED:
+            interval = self.min_interval
+        elif device.status == "offline" or device.last_updated is None:
+            interval = self.max_interval
+        else:
+            interval = (dt_util.utcnow() - device.last_updated) * self.IDLE_FACTOR
+
+        return min(max(interval * stretch, self.min_interval), self.max_interval)
+
+    def schedule(self, devices: list[Device], stretch: float = 1.0) -> timedelta:
+        """Return the time until the first device is due.
+
+        All devices are polled with a single request, so they are polled at
+        the shortest interval of any device.
+        """
+        return min(
+            (self.interval(device, stretch) for device in devices),
+            default=self.max_interval,
+        )
+
+
+class PushHealth:
+    """Track the health of the push channel (websocket).
+
+    The push channel is considered healthy if it is connected and received a
+    message recently. The connection is tracked through the HTTP session of
+    the account, see `trace_config`.
+    """
+
+    # Time without messages after which the push channel is considered quiet.
+    QUIET_TIMEOUT = timedelta(minutes=30)
+
+    # Factor to stretch poll intervals with while the push channel is healthy.
+    STRETCH = 4.0
+
+    connected: bool
+    connects: int
+    messages: int
+    last_message: datetime | None
+
+    def __init__(self) -> None:
+        """Initialize the push health."""
+        self.connected = False
+        self.connects = 0
+        self.messages = 0
+        self.message_rate = RateCounter()
+        self.last_message = None
+
+    @property
+    def reconnects(self) -> int:
+        """Return the number of reconnects."""
+        return max(self.connects - 1, 0)
+
+    @property
+    def healthy(self) -> bool:
+        """Return True if updates are pushed reliably."""
+        return (
+            self.connected
+            and self.last_message is not None
+            and dt_util.utcnow() - self.last_message < self.QUIET_TIMEOUT
+        )
+
+    @property
+    def stretch(self) -> float:
+        """Return the factor to stretch poll intervals with."""
+        return self.STRETCH if self.healthy else 1.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config that registers when the websocket opens."""
+
+        async def _on_request_end(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestEndParams,
+        ) -> None:
+            if params.response.status == 101:
+                self.connected = True
+                self.connects += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_end.append(_on_request_end)
+
+        return trace_config
+
+    def message_received(self) -> None:
+        """Register a received message."""
+        self.messages += 1
+        self.message_rate.add()
+        self.last_message = dt_util.utcnow()
+
+
+class TheftTracker:
+    """Determine which devices should be tracked at high frequency.
+
+    Devices that are marked as stolen or have a triggered alarm have their
+    position polled at a short interval. To bound the number of requests,
+    tracking stops after a while, and only a limited number of devices is
+    tracked at once. A device is tracked again once it has been recovered and
+    is stolen or alarmed again.
+    """
+
+    INTERVAL = timedelta(seconds=20)
+    DURATION = timedelta(minutes=30)
+
+    # Maximum number of devices that are tracked at the same time.
+    MAX_DEVICES = 3
+
+    tracking: dict[int, datetime]
+
+    def __init__(self) -> None:
+        """Initialize the theft tracker."""
+        self.tracking = {}
+        self._expired: set[int] = set()
+
+    def update(self, devices: list[Device]) -> None:
+        """Start or stop tracking devices, based on their state."""
+        now = dt_util.utcnow()
+        active = {
+            device.id
+            for device in devices
+            if device.is_stolen or device.is_alarm_triggered
+        }
+
+        # Recovered devices can be tracked again.
+        self._expired &= active
+
+        for device_id, until in list(self.tracking.items()):
+            if device_id not in active:
+                del self.tracking[device_id]
+            elif until <= now:
+                del self.tracking[device_id]
+                self._expired.add(device_id)
+
+        for device_id in sorted(active - self._expired - self.tracking.keys()):
+            if len(self.tracking) >= self.MAX_DEVICES:
+                break
+
+            self.tracking[device_id] = now + self.DURATION
+
+
+class BikeTraxDataUpdateCoordinator(DataUpdateCoordinator[set[int]]):
+    """Base class for the BikeTrax data update coordinators.
+
+    The data of each coordinator is the set of device identifiers that changed
+    during the last update. Entities only need to update if their device is in
+    that set.
+    """
+
+    # Priority of the requests made during an update.
+    request_priority = PRIORITY_BACKGROUND
+
     account: Account
-    read_only: bool
+    last_update_duration: float | None
+    stale: bool
+    state_writes: int
+    suppressed_writes: int
+    update_path: str | None
+    commands_sent: int
+    commands_coalesced: int
+    last_command_latency: float | None
 
     def __init__(
-        self, hass: HomeAssistant, account: Account, entry: ConfigEntry, **kwargs
+        self,
+        hass: HomeAssistant,
+        account: Account,
+        entry: ConfigEntry,
+        semaphore: asyncio.Semaphore,
+        retry_policy: RetryPolicy,
+        rate_limiter: RateLimiter,
+        **kwargs,
     ) -> None:
-        """Initialize account-wide BikeTrax data update coordinator."""
+        """Initialize account-wide BikeTrax data update coordinator.
+
+        The semaphore, retry policy and rate limiter are shared between all
+        coordinators of an account. The semaphore limits the number of
+        concurrent requests for that account.
+        """
         self.account = account
-        self.read_only = entry.options.get(CONF_READ_ONLY, False)
+        self.last_update_duration = None
+        self.stale = False
+
+        # Counters of entity state writes, and writes that were skipped
+        # because nothing changed.
+        self.state_writes = 0
+        self.suppressed_writes = 0
+
+        # Counters of commands that were sent, and changes that were
+        # coalesced into a later command.
+        self.commands_sent = 0
+        self.commands_coalesced = 0
+        self.last_command_latency = None
+
+        # Latency of the device data, and the path (poll or push) of the data
+        # of the last update. The path is unknown for coordinators that do
+        # not retrieve device data.
+        self.latency = LatencyTracker()
+        self.update_path = None
+
+        self.metrics = CoordinatorMetrics()
+
+        self._semaphore = semaphore
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+
+        self._account_key = account_key(entry.data[CONF_USERNAME])
+        self._domain_scheduler = async_get_scheduler(hass)
+        self._update_failed = False
+        self._listeners_available: bool | None = None
+        self._context_listeners: dict[Any, dict[CALLBACK_TYPE, CALLBACK_TYPE]] = {}
+
+        # The coordinator may be shared by multiple config entries, so it is
+        # not tied to the config entry that creates it. It is shut down when
+        # the account is released instead.
+        super().__init__(hass, _LOGGER, config_entry=None, **kwargs)
+
+        self._poll_interval = self.update_interval
+
+    async def async_first_refresh(self) -> None:
+        """Refresh data for the first time, during setup of a config entry.
+
+        Raises `ConfigEntryNotReady` if the refresh fails. This replaces
+        `async_config_entry_first_refresh`, which requires the coordinator to
+        be tied to a config entry.
+        """
+        await self.async_refresh()
+
+        if self.last_update_success:
+            return
 
-        super().__init__(hass, _LOGGER, **kwargs)
+        raise ConfigEntryNotReady from self.last_exception
+
+    @callback
+    def async_set_stale(self) -> None:
+        """Mark the data of all devices as restored from a snapshot.
+
+        The data is considered stale until the next successful update.
+        """
+        self.stale = True
+        self.data = {device.id for device in self.account.devices}
+
+    @callback
+    def async_record_command(self, latency: float) -> None:
+        """Register a command that was sent, and its round-trip latency."""
+        self.commands_sent += 1
+        self.last_command_latency = latency
+
+    async def _async_update_data(self) -> set[int]:
+        """Fetch data from BikeTrax, if allowed by the retry policy.
+
+        Returns the identifiers of the devices that changed.
+        """
+        self._update_failed = True
+
+        try:
+            if not self.retry_policy.allow_request():
+                raise UpdateFailed(
+                    "Not updating because of previous errors, retrying after "
+                    f"{self.retry_policy.retry_at}."
+                )
+
+            try:
+                async with self._domain_scheduler.semaphore:
+                    start = time.monotonic()
+
+                    try:
+                        with request_priority(self.request_priority):
+                            data = await self._async_update()
+                    finally:
+                        self.metrics.refresh_duration.add(time.monotonic() - start)
+            except asyncio.CancelledError:
+                self.retry_policy.record_cancelled()
+                raise
+            except Exception as err:
+                self.metrics.record_error(err)
+                self.retry_policy.record_failure()
+                raise
+
+            self.retry_policy.record_success()
+            self._update_failed = False
+
+            return data
+        finally:
+            self._async_schedule()
+
+    async def _async_update(self) -> set[int]:
+        """Fetch data from BikeTrax."""
+        raise NotImplementedError
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        The listeners are also indexed by their context, see
+        `async_update_listeners`.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        listeners = self._context_listeners.setdefault(context, {})
+        listeners[remove_listener] = update_callback
+
+        @callback
+        def _remove_listener() -> None:
+            del listeners[remove_listener]
+            remove_listener()
+
+        return _remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners, and count the resulting state writes.
+
+        Entities pass their device identifier as context. While their
+        availability is unchanged, only the listeners of the devices that
+        changed are updated, as the other entities would not write their state
+        anyway. Listeners without a context are always updated.
+        """
+        state_writes = self.state_writes
+        available = self.last_update_success or self.stale
+
+        if available == self._listeners_available:
+            for context in (None, *(self.data or ())):
+                for update_callback in list(
+                    self._context_listeners.get(context, {}).values()
+                ):
+                    update_callback()
+        else:
+            super().async_update_listeners()
+
+        self._listeners_available = available
+
+        self.metrics.writes_per_update.add(self.state_writes - state_writes)
+
+    def poll_interval(self) -> timedelta:
+        """Return the desired time between two updates."""
+        return self._poll_interval
+
+    def max_poll_interval(self) -> timedelta | None:
+        """Return the maximum time between two updates, if any."""
+        return None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Schedule the next update, aligned to the slot of the account.
+
+        While the retry policy refuses requests, the update is scheduled for
+        when they are allowed again. After a failed update, the update is
+        retried after the backoff of the retry policy instead, which may be
+        much sooner than the poll interval.
+        """
+        if (delay := self.retry_policy.retry_delay()) is not None:
+            self.update_interval = delay
+        elif self._update_failed:
+            self.update_interval = self.retry_policy.backoff()
+        else:
+            self.update_interval = self._domain_scheduler.align(
+                self._account_key, self.poll_interval(), self.max_poll_interval()
+            )
+
+        _LOGGER.debug("%s will update in %s.", self.name, self.update_interval)
+
+    async def _async_update_devices(
+        self,
+        devices: list[Device],
+        update_fn: Callable[[Device], Awaitable[None]],
+    ) -> dict[int, exceptions.BikeTraxError]:
+        """Invoke `update_fn` for all devices concurrently.
+
+        The number of concurrent requests is bounded by the shared semaphore.
+        A device that fails to update does not affect the others, and retains
+        the data of its last successful update. The errors of the failed
+        devices are returned, keyed by device identifier.
+
+        Raises `UpdateFailed` if all devices failed to update.
+        """
+
+        async def _update(device: Device) -> None:
+            async with self._semaphore:
+                await update_fn(device)
+
+        results = await asyncio.gather(
+            *(_update(device) for device in devices), return_exceptions=True
+        )
+
+        errors: dict[int, exceptions.BikeTraxError] = {}
+
+        for device, result in zip(devices, results):
+            if isinstance(result, exceptions.BikeTraxError):
+                _LOGGER.warning(
+                    "A BikeTrax error occurred while updating device %s: %s",
+                    device.id,
+                    result,
+                )
+                self.metrics.record_error(result)
+                errors[device.id] = result
+            elif isinstance(result, BaseException):
+                raise result
+
+        if devices and len(errors) == len(devices):
+            raise UpdateFailed(
+                "A BikeTrax error occurred while updating all devices: "
+                f"{next(iter(errors.values()))}"
+            )
+
+        return errors
 
 
 class DeviceDataUpdateCoordinator(BikeTraxDataUpdateCoordinator):
     """Class to manage fetching BikeTrax data."""
 
+    # Device updates include the alarm state, so they take precedence over the
+    # other background updates.
+    request_priority = PRIORITY_DEVICE
+
     def __init__(
-        self, hass: HomeAssistant, account: Account, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        account: Account,
+        entry: ConfigEntry,
+        semaphore: asyncio.Semaphore,
+        retry_policy: RetryPolicy,
+        rate_limiter: RateLimiter,
+        token_store: TokenStore,
+        api_metrics: ApiMetrics,
+        push_health: PushHealth,
     ) -> None:
         """Initialize account-wide BikeTrax device update coordinator."""
         super().__init__(
             hass,
             account,
             entry,
+            semaphore,
+            retry_policy,
+            rate_limiter,
             name=f"{DOMAIN}-{entry.data['username']}-device",
             update_interval=SCAN_INTERVAL_DEVICE,
         )
 
-    async def _async_update_data(self) -> None:
+        self.token_store = token_store
+        self.api_metrics = api_metrics
+        self.expired_subscriptions: set[int] = set()
+
+        self._devices_updated = asyncio.Event()
+        self._fingerprints: dict[int, tuple] = {}
+        self._prefetched = False
+
+        self.push_health = push_health
+        self._push_started = False
+        self._cancel_quiet: CALLBACK_TYPE | None = None
+
+        self._coalesce_window = timedelta(
+            milliseconds=entry.options.get(
+                CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+            )
+        )
+        self._pending: set[int] = set()
+        self._cancel_flush: CALLBACK_TYPE | None = None
+
+        self.theft_tracker = TheftTracker()
+        self._cancel_tracking: CALLBACK_TYPE | None = None
+
+        # If enabled, device trackers ignore location updates that are within
+        # the GPS accuracy. Ignored updates are counted.
+        self.ignore_jitter = entry.options.get(CONF_IGNORE_JITTER, False)
+        self.suppressed_jitter = 0
+
+        self.scheduler = DevicePollScheduler(
+            timedelta(
+                minutes=entry.options.get(
+                    CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                )
+            ),
+            timedelta(
+                minutes=entry.options.get(
+                    CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                )
+            ),
+        )
+
+    def max_poll_interval(self) -> timedelta:
+        """Return the maximum time between two updates.
+
+        Aligning the updates never delays them beyond the maximum interval, so
+        guarded devices are polled at least that often.
+        """
+        return self.scheduler.max_interval
+
+    @callback
+    def _async_schedule(self, devices: list[Device] | None = None) -> None:
+        """Schedule the next update, and track stolen or alarmed devices.
+
+        The next update is due when the first device is due. If `devices` is
+        given, only those devices were updated, e.g. by a pushed update. The
+        interval is then only shortened for them, until the next poll
+        schedules all devices again, so bursts of pushed updates do not
+        reschedule the whole fleet for every update.
+        """
+        interval = self.scheduler.schedule(
+            self.account.devices if devices is None else devices,
+            self.push_health.stretch,
+        )
+
+        if devices is not None:
+            interval = min(interval, self._poll_interval)
+
+        self._poll_interval = interval
+
+        super()._async_schedule()
+
+        if devices is None or any(
+            device.is_stolen
+            or device.is_alarm_triggered
+            or device.id in self.theft_tracker.tracking
+            for device in devices
+        ):
+            self._async_update_tracking()
+
+    @callback
+    def async_record_command(self, latency: float) -> None:
+        """Register a command that was sent, and its round-trip latency.
+
+        A command may have marked a device as stolen, so tracking is updated.
+        """
+        super().async_record_command(latency)
+
+        self._async_update_tracking()
+
+    @callback
+    def _async_update_tracking(self) -> None:
+        """Start tracking stolen or alarmed devices, if not yet started.
+
+        Tracking only runs while the background task runs.
+        """
+        tracking = set(self.theft_tracker.tracking)
+
+        self.theft_tracker.update(self.account.devices)
+
+        if self.theft_tracker.tracking.keys() - tracking:
+            _LOGGER.info(
+                "Tracking device(s) %s at high frequency.",
+                self.theft_tracker.tracking.keys() - tracking,
+            )
+
+        if (
+            self._push_started
+            and self.theft_tracker.tracking
+            and self._cancel_tracking is None
+        ):
+            self._cancel_tracking = async_call_later(
+                self.hass, TheftTracker.INTERVAL, self._async_track
+            )
+
+    async def _async_track(self, *args: Any) -> None:
+        """Update the positions of the tracked devices.
+
+        The devices are retrieved first, as their position identifiers point to
+        the latest positions. Tracking is skipped while the retry policy is not
+        closed, so it never takes the probe of a regular update.
+        """
+        self._cancel_tracking = None
+
+        self.theft_tracker.update(self.account.devices)
+
+        if self.theft_tracker.tracking and self.retry_policy.state == STATE_CLOSED:
+            try:
+                with request_priority(self.request_priority):
+                    await self.account.update_devices()
+
+                    await self._async_update_devices(
+                        [
+                            device
+                            for device in self.account.devices
+                            if device.id in self.theft_tracker.tracking
+                        ],
+                        lambda device: device.update_position(),
+                    )
+            except (exceptions.BikeTraxError, UpdateFailed) as err:
+                _LOGGER.debug("Unable to track device(s): %s", err)
+
+            if changed := self._changed_devices(PATH_POLL):
+                self.async_set_updated_data(changed)
+
+        self._async_update_tracking()
+
+    async def async_wait_devices(self) -> None:
+        """Wait until the first attempt to retrieve the devices completed.
+
+        The attempt may have failed, in which case no devices are available.
+        """
+        await self._devices_updated.wait()
+
+    @callback
+    def async_set_prefetched(self) -> None:
+        """Mark the devices as retrieved right before setup.
+
+        The next update only retrieves the positions of the devices.
+        """
+        self._prefetched = True
+
+    @callback
+    def async_set_stale(self) -> None:
+        """Mark the data of all devices as restored from a snapshot."""
+        super().async_set_stale()
+
+        # Changes are relative to the restored data.
+        self._changed_devices()
+
+    def _changed_devices(
+        self, path: str | None = None, devices: list[Device] | None = None
+    ) -> set[int]:
+        """Return the identifiers of the devices that changed since last call.
+
+        If `path` is given, the latency of the changed devices is recorded. If
+        `devices` is given, only those devices are compared, e.g. the device
+        of a pushed update. Otherwise, all devices are.
+        """
+        fingerprints = {
+            device.id: _fingerprint(device)
+            for device in (self.account.devices if devices is None else devices)
+        }
+
+        changed = {
+            device_id
+            for device_id, fingerprint in fingerprints.items()
+            if self._fingerprints.get(device_id) != fingerprint
+        }
+
+        if devices is None:
+            self._fingerprints = fingerprints
+        else:
+            self._fingerprints.update(fingerprints)
+
+        if path is not None:
+            self.update_path = path
+
+            for device in self.account.devices if devices is None else devices:
+                if device.id in changed:
+                    self.latency.record(STAGE_RECEIVE, path, device.last_updated)
+
+        return changed
+
+    async def _async_update(self) -> set[int]:
         """Fetch data from BikeTrax."""
         _LOGGER.debug("Device data coordinator updating.")
 
+        start = time.monotonic()
+
         try:
-            last_updated = {
-                device.id: device.last_updated for device in self.account.devices
-            }
-
-            await self.account.update_devices()
-
-            for device in self.account.devices:
-                if device.subscription_until:
-                    if device.subscription_until < dt_util.now():
-                        _LOGGER.warning(
-                            "Device %s seems to have an expired subscription. "
-                            "No device updates are expected.",
-                            device.id,
-                        )
-
-                if device.last_updated == last_updated.get(device.id):
-                    _LOGGER.debug(
-                        "Not updating position for device %s because it has not "
-                        "changed.",
-                        device.id,
-                    )
-                    continue
+            if self._prefetched:
+                self._prefetched = False
 
-                await device.update_position()
+                # Positions have not been retrieved yet, so all devices are
+                # considered updated.
+                last_updated = {}
+            else:
+                last_updated = {
+                    device.id: device.last_updated for device in self.account.devices
+                }
+
+                await self.account.update_devices()
         except exceptions.BikeTraxError as err:
             raise UpdateFailed(
                 f"A BikeTrax error occurred while updating the devices: {err}"
             ) from err
+        finally:
+            self._devices_updated.set()
+
+        devices = []
+        self.expired_subscriptions = set()
+
+        for device in self.account.devices:
+            if device.subscription_until:
+                if device.subscription_until < dt_util.now():
+                    self.expired_subscriptions.add(device.id)
+
+                    _LOGGER.warning(
+                        "Device %s seems to have an expired subscription. "
+                        "No device updates are expected.",
+                        device.id,
+                    )
+
+            if device.last_updated == last_updated.get(device.id):
+                _LOGGER.debug(
+                    "Not updating position for device %s because it has not "
+                    "changed.",
+                    device.id,
+                )
+                continue
+
+            devices.append(device)
+
+        try:
+            errors = await self._async_update_devices(
+                devices, lambda device: device.update_position()
+            )
+        finally:
+            self.last_update_duration = time.monotonic() - start
+
+        _LOGGER.debug(
+            "Device data coordinator updated %d position(s) in %.3f seconds, "
+            "%d failed.",
+            len(devices),
+            self.last_update_duration,
+            len(errors),
+        )
+
+        self.stale = False
+
+        return self._changed_devices(PATH_POLL)
 
     def start_background_task(self):
         """Start the websocket task."""
 
+        # The account does not report connection changes of the websocket, nor
+        # which device an update is for, so the socket is wrapped to track
+        # them.
+        create_socket = self.account.traccar_api.create_socket
+        pushed: list[Device] = []
+
+        async def _create_socket():
+            try:
+                async for update in create_socket():
+                    pushed.clear()
+
+                    # Positions of unknown devices are not reported until the
+                    # device itself is.
+                    if isinstance(update, models.Device):
+                        pushed.append(Device(self.account, update.id))
+                    elif update.device_id in self._fingerprints:
+                        pushed.append(Device(self.account, update.device_id))
+
+                    yield update
+            finally:
+                self.push_health.connected = False
+                self._async_cancel_quiet()
+
+                if self._push_started:
+                    _LOGGER.debug("Push channel disconnected, tightening polling.")
+
+                    self._async_schedule()
+                    self.hass.async_create_task(self.async_request_refresh())
+
+        self.account.traccar_api.create_socket = _create_socket
+
         def _on_update():
-            _LOGGER.debug("Device data update received.")
-            self.async_set_updated_data(None)
+            self.push_health.message_received()
+
+            # Polling is tightened again if the push channel goes quiet.
+            self._async_cancel_quiet()
+            self._cancel_quiet = async_call_later(
+                self.hass, PushHealth.QUIET_TIMEOUT, self._async_push_quiet
+            )
+
+            changed = self._changed_devices(PATH_PUSH, pushed)
+
+            _LOGGER.debug(
+                "Device data update received, %d device(s) changed.", len(changed)
+            )
+
+            if not changed:
+                return
+
+            self._pending.update(changed)
+
+            # Bursts of updates are coalesced into a single update, unless an
+            # alarm was triggered.
+            if not self._coalesce_window or any(
+                device.is_alarm_triggered for device in pushed
+            ):
+                self._flush_pending()
+            elif self._cancel_flush is None:
+                self._cancel_flush = async_call_later(
+                    self.hass, self._coalesce_window, self._flush_pending
+                )
 
+        self._push_started = True
         self.account.start(on_update=_on_update)
 
+        self._async_update_tracking()
+
     async def stop_background_task(self):
         """Stop the websocket task"""
+        self._push_started = False
+
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+        if self._cancel_tracking is not None:
+            self._cancel_tracking()
+            self._cancel_tracking = None
+
+        self._async_cancel_quiet()
+
         await self.account.stop()
 
+    @callback
+    def _async_cancel_quiet(self) -> None:
+        """Cancel the re-evaluation of a quiet push channel."""
+        if self._cancel_quiet is not None:
+            self._cancel_quiet()
+            self._cancel_quiet = None
+
+    @callback
+    def _async_push_quiet(self, *args: Any) -> None:
+        """Tighten polling, because no updates were pushed for a while."""
+        self._cancel_quiet = None
+
+        _LOGGER.debug("Push channel quiet, tightening polling.")
+
+        self._async_schedule()
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _flush_pending(self, *args: Any) -> None:
+        """Notify the entities of the devices with pending updates."""
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+        changed, self._pending = self._pending, set()
+
+        _LOGGER.debug("Flushing pushed updates of %d device(s).", len(changed))
+
+        self._async_schedule([Device(self.account, device_id) for device_id in changed])
+        self.async_set_updated_data(changed)
+
 
 class TripDataUpdateCoordinator(BikeTraxDataUpdateCoordinator):
     def __init__(
-        self, hass: HomeAssistant, account: Account, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        account: Account,
+        entry: ConfigEntry,
+        semaphore: asyncio.Semaphore,
+        retry_policy: RetryPolicy,
+        rate_limiter: RateLimiter,
     ) -> None:
         """Initialize account-wide BikeTrax trip update coordinator."""
         super().__init__(
             hass,
             account,
             entry,
+            semaphore,
+            retry_policy,
+            rate_limiter,
             name=f"{DOMAIN}-{entry.data['username']}-trip",
             update_interval=SCAN_INTERVAL_TRIPS,
         )
 
-    async def _async_update_data(self) -> None:
+        # The end time of the newest known trip per device is persisted, so
+        # only newer trips have to be retrieved, even after a restart.
+        self._store: Store[dict[str, str]] = Store(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY_TRIPS.format(account=account_key(entry.data[CONF_USERNAME])),
+        )
+        self._cursors: dict[str, str] | None = None
+
+    async def _async_update_trips(self, device: Device) -> None:
+        """Update the trips of a device that are newer than its cursor."""
+        assert self._cursors is not None
+
+        cursor = self._cursors.get(str(device.id))
+        from_date = dt_util.parse_datetime(cursor) if cursor else None
+
+        await device.update_trips(from_date=from_date)
+
+        new_trips = [
+            trip
+            for trip in device.trips
+            if from_date is None or trip.end_time > from_date
+        ]
+
+        if not new_trips:
+            return
+
+        _LOGGER.debug(
+            "Retrieved %d new trip(s) for device %s.", len(new_trips), device.id
+        )
+
+        self._cursors[str(device.id)] = max(
+            trip.end_time for trip in new_trips
+        ).isoformat()
+
+    async def _async_update(self) -> set[int]:
         """Fetch data from BikeTrax."""
         _LOGGER.debug("Trip data coordinator updating.")
 
+        start = time.monotonic()
+
+        if self._cursors is None:
+            self._cursors = await self._store.async_load() or {}
+
+        cursors = dict(self._cursors)
+        devices = self.account.devices
+
         try:
-            for device in self.account.devices:
-                await device.update_trips()
-        except exceptions.BikeTraxError as err:
-            raise UpdateFailed(
-                f"A BikeTrax error occurred while updating the trips: {err}"
-            ) from err
+            errors = await self._async_update_devices(devices, self._async_update_trips)
+        finally:
+            self.last_update_duration = time.monotonic() - start
+
+            if self._cursors != cursors:
+                await self._store.async_save(self._cursors)
+
+        _LOGGER.debug(
+            "Trip data coordinator updated in %.3f seconds, %d failed.",
+            self.last_update_duration,
+            len(errors),
+        )
+
+        self.stale = False
+
+        return {device.id for device in devices if device.id not in errors}
 
 
 class SubscriptionDataUpdateCoordinator(BikeTraxDataUpdateCoordinator):
+    # Bounds of the update interval while subscriptions are active.
+    MIN_INTERVAL = timedelta(hours=1)
+    MAX_INTERVAL = timedelta(days=7)
+
+    # Fraction of the time until the earliest expiry that is used as the
+    # update interval.
+    EXPIRY_FACTOR = 0.5
+
     def __init__(
-        self, hass: HomeAssistant, account: Account, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        account: Account,
+        entry: ConfigEntry,
+        semaphore: asyncio.Semaphore,
+        retry_policy: RetryPolicy,
+        rate_limiter: RateLimiter,
     ) -> None:
         """Initialize account-wide BikeTrax subscription update coordinator."""
         super().__init__(
             hass,
             account,
             entry,
+            semaphore,
+            retry_policy,
+            rate_limiter,
             name=f"{DOMAIN}-{entry.data['username']}-subscription",
             update_interval=SCAN_INTERVAL_SUBSCRIPTION,
         )
 
-    async def _async_update_data(self) -> None:
+        self._expired: set[int] = set()
+
+    def poll_interval(self) -> timedelta:
+        """Return the time until the subscriptions should be updated.
+
+        Subscriptions are updated less frequently the further away the
+        earliest expiry is. Once expired, they are updated at the default
+        interval to pick up renewals.
+        """
+        expiries = [
+            device.subscription_until
+            for device in self.account.devices
+            if device.subscription_until
+        ]
+
+        if not expiries:
+            return SCAN_INTERVAL_SUBSCRIPTION
+
+        remaining = min(expiries) - dt_util.now()
+
+        if remaining <= timedelta(0):
+            return SCAN_INTERVAL_SUBSCRIPTION
+
+        return min(
+            max(remaining * self.EXPIRY_FACTOR, self.MIN_INTERVAL), self.MAX_INTERVAL
+        )
+
+    @callback
+    def async_check_expired(self, expired: set[int]) -> None:
+        """Update the subscriptions if devices with an expired one are found.
+
+        Only devices that were not known to be expired trigger an update.
+        """
+        if expired - self._expired:
+            _LOGGER.debug(
+                "Updating subscriptions because device(s) %s expired.",
+                expired - self._expired,
+            )
+
+            self.hass.async_create_task(self.async_request_refresh())
+
+        self._expired = set(expired)
+
+    async def _async_update(self) -> set[int]:
         """Fetch data from BikeTrax."""
         _LOGGER.debug("Subscription data coordinator updating.")
 
+        start = time.monotonic()
+
+        devices = self.account.devices
+
         try:
-            for device in self.account.devices:
-                await device.update_subscription()
-        except exceptions.BikeTraxError as err:
-            raise UpdateFailed(
-                f"A BikeTrax error occurred while updating the subscription data: {err}"
-            ) from err
+            errors = await self._async_update_devices(
+                devices, lambda device: device.update_subscription()
+            )
+        finally:
+            self.last_update_duration = time.monotonic() - start
+
+        _LOGGER.debug(
+            "Subscription data coordinator updated in %.3f seconds, %d failed.",
+            self.last_update_duration,
+            len(errors),
+        )
+
+        self.stale = False
+
+        return {device.id for device in devices if device.id not in errors}
@@ -3,21 +3,58 @@
 from __future__ import annotations
 
 import logging
-from typing import Literal
+import math
+from datetime import datetime, timedelta
+from typing import Any, Literal
 
+import homeassistant.util.dt as dt_util
 from aiobiketrax import Device
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import BikeTraxBaseEntity
-from .const import ATTR_ALTITUDE, ATTR_COURSE, ATTR_SPEED, DATA_DEVICE, DOMAIN
-from .coordinator import BikeTraxDataUpdateCoordinator
+from .const import (
+    ATTR_ALTITUDE,
+    ATTR_COURSE,
+    ATTR_FIX_TIME,
+    ATTR_SPEED,
+    DATA_DEVICE,
+    DOMAIN,
+)
+from .coordinator import DeviceDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Mean radius of the earth, in meters.
+EARTH_RADIUS = 6371008.8
+
+# Minimum distance (in meters) a device has to move to update its location,
+# if jitter is ignored.
+MIN_DISPLACEMENT = 10.0
+
+# Maximum time a location update can be ignored.
+MAX_LOCATION_AGE = timedelta(hours=1)
+
+
+def haversine(
+    latitude1: float, longitude1: float, latitude2: float, longitude2: float
+) -> float:
+    """Return the great-circle distance between two locations, in meters."""
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(longitude2 - longitude1)
+
+    a = (
+        math.sin(delta_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -25,9 +62,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the BikeTrax tracker from config entry."""
-    coordinator: BikeTraxDataUpdateCoordinator = hass.data[DOMAIN][
-        config_entry.entry_id
-    ][DATA_DEVICE]
+    coordinator: DeviceDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        DATA_DEVICE
+    ]
     entities: list[BikeTraxDeviceTracker] = []
 
     for device in coordinator.account.devices:
@@ -47,12 +84,14 @@ async def async_setup_entry(
 class BikeTraxDeviceTracker(BikeTraxBaseEntity, TrackerEntity):
     """Representation of a BikeTrax device tracker."""
 
+    coordinator: DeviceDataUpdateCoordinator
+
     _attr_force_update = False
     _attr_icon = "mdi:bike"
 
     def __init__(
         self,
-        coordinator: BikeTraxDataUpdateCoordinator,
+        coordinator: DeviceDataUpdateCoordinator,
         device: Device,
     ) -> None:
         """Initialize the tracker."""
@@ -61,6 +100,78 @@ class BikeTraxDeviceTracker(BikeTraxBaseEntity, TrackerEntity):
         self._attr_name = device.name
         self._attr_unique_id = f"{device.id}-location"
 
+        # Reported latitude, longitude and accuracy, the attributes of the same
+        # fix, and when they were last updated.
+        self._location: tuple[float, float, int] | None = None
+        self._attributes: dict[str, Any] = {}
+        self._location_updated: datetime | None = None
+
+        # Last evaluated fix, so each fix is evaluated only once.
+        self._fix: tuple | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_location()
+
+        super()._handle_coordinator_update()
+
+    @callback
+    def _update_location(self) -> None:
+        """Update the reported location of the device.
+
+        If jitter is ignored, the location is only updated if the device moved
+        further than the accuracy of its old or new location, or if the
+        reported location is getting old. The attributes of a suppressed fix
+        are not reported either, so they always belong to the location.
+
+        A new fix at the same location (e.g. of a parked device) is ignored as
+        well, until the reported location is getting old, so its fix time does
+        not cause a state write for every fix.
+        """
+        latitude = self.device.latitude
+        longitude = self.device.longitude
+
+        if not self.device.is_tracking_enabled or latitude is None or longitude is None:
+            self._location = None
+            self._attributes = {}
+            self._fix = None
+            return
+
+        location = (latitude, longitude, self.device.accuracy or 0)
+        fix = (self.device.fix_time, *location)
+
+        # Other updates of the device leave the fix unchanged.
+        if fix == self._fix:
+            return
+
+        self._fix = fix
+
+        now = dt_util.utcnow()
+
+        if (
+            self._location is not None
+            and self._location_updated is not None
+            and now - self._location_updated < MAX_LOCATION_AGE
+        ):
+            if location == self._location:
+                return
+
+            if self.coordinator.ignore_jitter and haversine(
+                *self._location[:2], *location[:2]
+            ) <= max(self._location[2], location[2], MIN_DISPLACEMENT):
+                self.coordinator.suppressed_jitter += 1
+                return
+
+        self._location = location
+        self._attributes = {
+            ATTR_ALTITUDE: self.device.altitude,
+            ATTR_COURSE: self.device.course,
+            ATTR_SPEED: self.device.speed,
+            ATTR_FIX_TIME: self.device.fix_time,
+        }
+        self._location_updated = now
+
     @property
     def battery_level(self) -> int | None:
         """Return the battery level of the device."""
@@ -69,16 +180,16 @@ class BikeTraxDeviceTracker(BikeTraxBaseEntity, TrackerEntity):
     @property
     def latitude(self) -> float | None:
         """Return latitude value of the device."""
-        return self.device.latitude if self.device.is_tracking_enabled else None
+        return self._location[0] if self._location is not None else None
 
     @property
     def longitude(self) -> float | None:
         """Return longitude value of the device."""
-        return self.device.longitude if self.device.is_tracking_enabled else None
+        return self._location[1] if self._location is not None else None
 
     @property
     def location_accuracy(self) -> int:
-        return self.device.accuracy if self.device.is_tracking_enabled else 0
+        return self._location[2] if self._location is not None else 0
 
     @property
     def source_type(self) -> Literal["gps"]:
@@ -86,13 +197,6 @@ class BikeTraxDeviceTracker(BikeTraxBaseEntity, TrackerEntity):
         return SourceType.GPS
 
     @property
-    def extra_state_attributes(self):
-        """Return device specific attributes."""
-        attrs = {}
-
-        if self.device.is_tracking_enabled:
-            attrs[ATTR_ALTITUDE] = self.device.altitude
-            attrs[ATTR_COURSE] = self.device.altitude
-            attrs[ATTR_SPEED] = self.device.speed
-
-        return attrs
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return device specific attributes of the reported location."""
+        return dict(self._attributes)
@@ -0,0 +1,119 @@
+"""Diagnostics support for BikeTrax."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_DEVICE,
+    DATA_SETUP_DURATION,
+    DATA_SUBSCRIPTION,
+    DATA_TRIP,
+    DOMAIN,
+    TO_REDACT,
+)
+from .coordinator import BikeTraxDataUpdateCoordinator, DeviceDataUpdateCoordinator
+
+
+def _coordinator_diagnostics(
+    coordinator: BikeTraxDataUpdateCoordinator,
+) -> dict[str, Any]:
+    """Return the diagnostics of a coordinator."""
+    return {
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "last_update_duration": coordinator.last_update_duration,
+        "stale": coordinator.stale,
+        "state_writes": coordinator.state_writes,
+        "suppressed_writes": coordinator.suppressed_writes,
+        "metrics": coordinator.metrics.as_dict(),
+    }
+
+
+def _account_diagnostics(coordinator: DeviceDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the diagnostics of the account of a device coordinator."""
+    push_health = coordinator.push_health
+    rate_limiter = coordinator.rate_limiter
+    retry_policy = coordinator.retry_policy
+
+    return {
+        "api": coordinator.api_metrics.as_dict(),
+        "auth": {
+            "logins": coordinator.token_store.logins,
+            "token_reuses": coordinator.token_store.reused,
+        },
+        "commands": {
+            "sent": coordinator.commands_sent,
+            "coalesced": coordinator.commands_coalesced,
+            "last_latency": coordinator.last_command_latency,
+        },
+        "latency": {
+            f"{stage}_{path}": {
+                "p50": window.p50,
+                "p95": window.p95,
+                "max": window.max,
+            }
+            for (stage, path), window in coordinator.latency.windows.items()
+        },
+        "push": {
+            "connected": push_health.connected,
+            "healthy": push_health.healthy,
+            "connects": push_health.connects,
+            "messages": push_health.messages,
+            "messages_per_minute": push_health.message_rate.per_minute,
+            "last_message": push_health.last_message,
+        },
+        "rate_limiter": {
+            "requests": rate_limiter.requests,
+            "waited": rate_limiter.waited,
+            "queue_depth": rate_limiter.queue_depth,
+            "max_queue_depth": rate_limiter.max_queue_depth,
+            "average_wait": rate_limiter.average_wait,
+            "max_wait": rate_limiter.max_wait,
+        },
+        "retry_policy": {
+            "state": retry_policy.state,
+            "failures": retry_policy.failures,
+            "retry_at": retry_policy.retry_at,
+        },
+        "scheduler": {
+            str(device.id): coordinator.scheduler.interval(
+                device, push_health.stretch
+            ).total_seconds()
+            for device in coordinator.account.devices
+        },
+        "suppressed_jitter": coordinator.suppressed_jitter,
+        "theft_tracking": {
+            str(device_id): until
+            for device_id, until in coordinator.theft_tracker.tracking.items()
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    device_coordinator: DeviceDataUpdateCoordinator = data[DATA_DEVICE]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "setup_duration": data.get(DATA_SETUP_DURATION),
+        "account": _account_diagnostics(device_coordinator),
+        "coordinators": {
+            key: _coordinator_diagnostics(data[key])
+            for key in (DATA_DEVICE, DATA_TRIP, DATA_SUBSCRIPTION)
+        },
+        "devices": [
+            async_redact_data(device._device.to_dict(), TO_REDACT)
+            for device in device_coordinator.account.devices
+        ],
+    }
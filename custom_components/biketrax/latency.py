@@ -0,0 +1,85 @@
+"""Measurement of the end-to-end latency of BikeTrax data."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+
+import homeassistant.util.dt as dt_util
+
+PATH_POLL = "poll"
+PATH_PUSH = "push"
+
+STAGE_RECEIVE = "receive"
+STAGE_WRITE = "write"
+
+
+class LatencyWindow:
+    """Rolling window of the most recent latency samples.
+
+    The window has a fixed size, so it uses constant memory.
+    """
+
+    SIZE = 128
+
+    def __init__(self) -> None:
+        """Initialize the window."""
+        self._samples: deque[float] = deque(maxlen=self.SIZE)
+
+    def add(self, latency: float) -> None:
+        """Add a sample (in seconds)."""
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0-100) of the samples, or None if empty."""
+        if not self._samples:
+            return None
+
+        samples = sorted(self._samples)
+        index = round(percentile / 100.0 * (len(samples) - 1))
+
+        return samples[index]
+
+    @property
+    def p50(self) -> float | None:
+        """Return the median of the samples."""
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float | None:
+        """Return the 95th percentile of the samples."""
+        return self.percentile(95)
+
+    @property
+    def max(self) -> float | None:
+        """Return the maximum of the samples."""
+        return max(self._samples, default=None)
+
+
+class LatencyTracker:
+    """Measure the time between a device update and its processing.
+
+    The latency is measured from the last update time reported by the
+    device to when the coordinator received the data, and to when an entity
+    wrote its state. Both are measured separately for polled and pushed data.
+    """
+
+    windows: dict[tuple[str, str], LatencyWindow]
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.windows = {
+            (stage, path): LatencyWindow()
+            for stage in (STAGE_RECEIVE, STAGE_WRITE)
+            for path in (PATH_POLL, PATH_PUSH)
+        }
+
+    def record(self, stage: str, path: str, last_updated: datetime | None) -> None:
+        """Record the latency of data that was last updated at `last_updated`."""
+        if last_updated is None:
+            return
+
+        # Clocks of the device and Home Assistant may differ slightly.
+        latency = max((dt_util.utcnow() - last_updated).total_seconds(), 0.0)
+
+        self.windows[stage, path].add(latency)
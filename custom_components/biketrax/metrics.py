@@ -0,0 +1,156 @@
+"""Lightweight metrics of the BikeTrax integration.
+
+All metrics use constant memory and constant time per observation, so they
+can be left enabled.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+# Upper bounds of the refresh duration buckets, in seconds.
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+# Upper bounds of the buckets of entity writes per coordinator update.
+WRITES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, math.inf)
+
+_ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+
+class Histogram:
+    """Histogram with fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """Initialize the histogram."""
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: float) -> None:
+        """Add an observation."""
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.counts[index] += 1
+                break
+
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dictionary."""
+        return {
+            "buckets": {
+                str(bucket): count for bucket, count in zip(self.buckets, self.counts)
+            },
+            "count": self.count,
+            "sum": round(self.sum, 3),
+        }
+
+
+class RateCounter:
+    """Count events per minute, over the last few minutes."""
+
+    # Number of (whole) minutes the rate is averaged over.
+    MINUTES = 5
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self._buckets: deque[list[int]] = deque(maxlen=self.MINUTES + 1)
+
+    def add(self) -> None:
+        """Count an event."""
+        minute = int(time.monotonic() // 60)
+
+        if self._buckets and self._buckets[-1][0] == minute:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([minute, 1])
+
+    @property
+    def per_minute(self) -> float:
+        """Return the average number of events per minute."""
+        minute = int(time.monotonic() // 60)
+
+        # The current minute is incomplete, so it is not counted.
+        count = sum(
+            count
+            for bucket, count in self._buckets
+            if minute - self.MINUTES <= bucket < minute
+        )
+
+        return count / self.MINUTES
+
+
+class CoordinatorMetrics:
+    """Metrics of a data update coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.refresh_duration = Histogram(DURATION_BUCKETS)
+        self.writes_per_update = Histogram(WRITES_BUCKETS)
+        self.errors: Counter[str] = Counter()
+
+    def record_error(self, err: BaseException) -> None:
+        """Count an error by type, preferably of the original exception."""
+        self.errors[type(err.__cause__ or err).__name__] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "refresh_duration": self.refresh_duration.as_dict(),
+            "writes_per_update": self.writes_per_update.as_dict(),
+            "errors": dict(self.errors),
+        }
+
+
+class ApiMetrics:
+    """Count the API requests of an account, by endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+    @staticmethod
+    def endpoint(method: str, url: URL) -> str:
+        """Return the endpoint of a request, without identifiers."""
+        return f"{method} {url.host}{_ID_PATTERN.sub('/{id}', url.path)}"
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config that counts all requests of a session."""
+
+        async def _on_request_start(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            self.requests[self.endpoint(params.method, params.url)] += 1
+
+        async def _on_request_exception(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestExceptionParams,
+        ) -> None:
+            self.errors[type(params.exception).__name__] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(_on_request_start)
+        trace_config.on_request_exception.append(_on_request_exception)
+
+        return trace_config
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+        }
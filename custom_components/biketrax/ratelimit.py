@@ -0,0 +1,172 @@
+"""Rate limiting of BikeTrax API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+
+import aiohttp
+from aiobiketrax import Account
+
+# Priorities of requests. Lower values are served first.
+PRIORITY_COMMAND = 0
+PRIORITY_DEVICE = 1
+PRIORITY_BACKGROUND = 2
+
+_PRIORITY: ContextVar[int] = ContextVar(
+    "biketrax_request_priority", default=PRIORITY_BACKGROUND
+)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Set the priority of all requests made within the context."""
+    token = _PRIORITY.set(priority)
+
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class RateLimiter:
+    """Token bucket rate limiter with prioritized waiters.
+
+    The limiter is shared by all requests of an account. It is hooked into the
+    HTTP session of the account, so every request (including the websocket
+    connection) takes a token. The login uses a session of its own, so it is
+    hooked into separately, see `attach_login`. Requests that have to wait are
+    served in order of priority, as set by `request_priority`.
+    """
+
+    # Sustained number of requests per second.
+    RATE = 2.0
+
+    # Maximum number of requests in a burst.
+    CAPACITY = 20
+
+    requests: int
+    waited: int
+    total_wait: float
+    max_wait: float
+    max_queue_depth: int
+
+    def __init__(self) -> None:
+        """Initialize the rate limiter."""
+        self._tokens = float(self.CAPACITY)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a token."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def average_wait(self) -> float:
+        """Return the average wait time (in seconds) of all requests."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config that limits all requests of a session."""
+
+        async def _on_request_start(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: aiohttp.TraceRequestStartParams,
+        ) -> None:
+            await self.acquire(_PRIORITY.get())
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(_on_request_start)
+
+        return trace_config
+
+    def attach_login(self, account: Account) -> None:
+        """Limit the logins of an account.
+
+        The login goes to the identity provider, with a session that is not
+        hooked into. Only logins that are actually made take a token.
+        """
+        identity_api = account.identity_api
+        login = identity_api.login
+
+        async def _login() -> None:
+            if identity_api.id_token is None:
+                await self.acquire(_PRIORITY.get())
+
+            await login()
+
+        identity_api.login = _login
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until a token is available, and take it."""
+        start = time.monotonic()
+
+        self._refill()
+        self.requests += 1
+
+        if not self.queue_depth and self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return
+
+        future = asyncio.get_running_loop().create_future()
+
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        self._schedule()
+
+        await future
+
+        wait = time.monotonic() - start
+
+        self.waited += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _refill(self) -> None:
+        """Add the tokens that became available since the last refill."""
+        now = time.monotonic()
+
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self.RATE, float(self.CAPACITY)
+        )
+        self._updated = now
+
+    def _schedule(self) -> None:
+        """Schedule serving the waiters when the next token is available."""
+        if self._wakeup is None and self._waiters:
+            self._wakeup = asyncio.get_running_loop().call_later(
+                max((1.0 - self._tokens) / self.RATE, 0.0), self._serve
+            )
+
+    def _serve(self) -> None:
+        """Hand out the available tokens, in order of priority."""
+        self._wakeup = None
+        self._refill()
+
+        while self._waiters and self._tokens >= 1.0:
+            _, _, future = heapq.heappop(self._waiters)
+
+            # Cancelled waiters do not take a token.
+            if future.done():
+                continue
+
+            self._tokens -= 1.0
+            future.set_result(None)
+
+        self._schedule()
@@ -0,0 +1,193 @@
+"""Registry of BikeTrax accounts shared between config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiobiketrax import Account
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_DEVICE, DATA_REGISTRY, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import (
+        BikeTraxDataUpdateCoordinator,
+        DeviceDataUpdateCoordinator,
+    )
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def account_key(username: str) -> str:
+    """Return the key of the account of a username.
+
+    The key is used to persist data of an account that is shared between
+    config entries. It does not reveal the username.
+    """
+    return hashlib.sha256(username.lower().encode()).hexdigest()[:16]
+
+
+class SharedAccount:
+    """Account and coordinators that are shared between config entries.
+
+    The coordinators and the HTTP session are not tied to the config entry
+    that created them, so they outlive it if other config entries still use
+    them. They are shut down when the last config entry is released.
+    """
+
+    account: Account
+    session: aiohttp.ClientSession
+    coordinators: dict[str, BikeTraxDataUpdateCoordinator]
+    entry_ids: set[str]
+
+    def __init__(
+        self,
+        account: Account,
+        session: aiohttp.ClientSession,
+        coordinators: dict[str, BikeTraxDataUpdateCoordinator],
+    ) -> None:
+        """Initialize the shared account."""
+        self.account = account
+        self.session = session
+        self.coordinators = coordinators
+        self.entry_ids = set()
+
+        self._on_release: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_on_release(self, func: CALLBACK_TYPE) -> None:
+        """Add a function to call when the last config entry is released."""
+        self._on_release.append(func)
+
+    async def async_shutdown(self) -> None:
+        """Release all listeners, and stop the account."""
+        while self._on_release:
+            self._on_release.pop()()
+
+        await self.async_stop()
+
+    async def async_stop(self) -> None:
+        """Stop the websocket and the coordinators, and detach the session."""
+        device_coordinator: DeviceDataUpdateCoordinator = self.coordinators[DATA_DEVICE]
+
+        await device_coordinator.stop_background_task()
+
+        for coordinator in self.coordinators.values():
+            await coordinator.async_shutdown()
+
+        self.session.detach()
+
+
+class AccountRegistry:
+    """Reference-counted registry of accounts, by username.
+
+    Config entries with the same username share one account, one set of
+    coordinators and one websocket connection. The first config entry creates
+    them, and they are shut down when the last config entry is released.
+    """
+
+    # Maximum age (in seconds) of an account validated by the config flow,
+    # for it to be reused by the setup of the config entry.
+    VALIDATED_TIMEOUT = 300
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._accounts: dict[str, SharedAccount] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._validated: dict[str, tuple[float, Account]] = {}
+
+    @staticmethod
+    def _key(entry: ConfigEntry) -> str:
+        """Return the registry key of a config entry."""
+        return entry.data[CONF_USERNAME].lower()
+
+    @callback
+    def async_add_validated(self, account: Account) -> None:
+        """Hand over an account that was validated by the config flow."""
+        self._validated[account.identity_api.username.lower()] = (
+            time.monotonic(),
+            account,
+        )
+
+    @callback
+    def async_pop_validated(self, entry: ConfigEntry) -> Account | None:
+        """Return the account validated for a config entry, if still recent.
+
+        The account is only returned if it was validated with the same
+        credentials as the config entry.
+        """
+        if (validated := self._validated.pop(self._key(entry), None)) is None:
+            return None
+
+        validated_at, account = validated
+
+        if time.monotonic() - validated_at > self.VALIDATED_TIMEOUT:
+            return None
+
+        if account.identity_api.password != entry.data[CONF_PASSWORD]:
+            return None
+
+        return account
+
+    async def async_acquire(
+        self,
+        entry: ConfigEntry,
+        factory: Callable[[ConfigEntry], Awaitable[SharedAccount]],
+    ) -> SharedAccount:
+        """Return the shared account of a config entry.
+
+        If no other config entry uses the same username, `factory` is invoked
+        to create it.
+        """
+        key = self._key(entry)
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (shared := self._accounts.get(key)) is None:
+                shared = self._accounts[key] = await factory(entry)
+            else:
+                _LOGGER.debug("Sharing account of '%s' with another entry.", key)
+
+            shared.entry_ids.add(entry.entry_id)
+
+        return shared
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Release the shared account of a config entry.
+
+        The account is shut down if no other config entry uses it.
+        """
+        key = self._key(entry)
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (shared := self._accounts.get(key)) is None:
+                return
+
+            shared.entry_ids.discard(entry.entry_id)
+
+            if shared.entry_ids:
+                return
+
+            del self._accounts[key]
+
+            _LOGGER.debug("Shutting down account of '%s'.", key)
+
+            await shared.async_shutdown()
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> AccountRegistry:
+    """Return the domain-wide account registry, creating it if necessary."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    if DATA_REGISTRY not in domain_data:
+        domain_data[DATA_REGISTRY] = AccountRegistry()
+
+    return domain_data[DATA_REGISTRY]
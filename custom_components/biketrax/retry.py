@@ -0,0 +1,116 @@
+"""Retry policy for BikeTrax API requests."""
+
+from __future__ import annotations
+
+import logging
+import random
+from datetime import datetime, timedelta
+
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_HALF_OPEN = "half_open"
+STATE_OPEN = "open"
+
+
+class RetryPolicy:
+    """Retry policy with exponential backoff, jitter and a circuit breaker.
+
+    The policy is shared by all coordinators of an account. After a number of
+    consecutive failures, the circuit opens and requests are refused until the
+    backoff delay expired. Then, a single request is allowed to probe the API.
+    If it succeeds, the circuit closes again. Otherwise, it re-opens with a
+    longer delay.
+    """
+
+    # Number of consecutive failures after which the circuit opens.
+    FAILURE_THRESHOLD = 3
+
+    BASE_DELAY = timedelta(seconds=30)
+    MAX_DELAY = timedelta(hours=1)
+
+    state: str
+    failures: int
+    retry_at: datetime | None
+
+    def __init__(self) -> None:
+        """Initialize the retry policy."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = None
+
+    def backoff(self) -> timedelta:
+        """Return the delay before the next attempt.
+
+        The delay doubles with every consecutive failure. Half of it is
+        randomized, so accounts do not retry at the same time.
+        """
+        # The factor is capped before multiplying, as the failures keep counting
+        # during long outages, and timedelta overflows.
+        delay = self.BASE_DELAY * min(
+            2 ** max(self.failures - self.FAILURE_THRESHOLD, 0),
+            self.MAX_DELAY / self.BASE_DELAY,
+        )
+
+        return delay / 2 + delay / 2 * random.random()
+
+    def retry_delay(self) -> timedelta | None:
+        """Return the time until requests are allowed again, if refused.
+
+        While half-open, another request probes the API, so its result is
+        awaited for the base delay.
+        """
+        if self.state == STATE_OPEN:
+            return max(self.retry_at - dt_util.utcnow(), timedelta(0))
+
+        if self.state == STATE_HALF_OPEN:
+            return self.BASE_DELAY
+
+        return None
+
+    def allow_request(self) -> bool:
+        """Return True if a request is allowed."""
+        if self.state == STATE_CLOSED:
+            return True
+
+        if self.state == STATE_OPEN and dt_util.utcnow() >= self.retry_at:
+            _LOGGER.debug("Circuit half-open, probing with a single request.")
+
+            self.state = STATE_HALF_OPEN
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """Register a successful request."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("API requests succeed again, circuit closed.")
+
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = None
+
+    def record_cancelled(self) -> None:
+        """Register a request that was cancelled before it completed.
+
+        A cancelled request says nothing about the API, so if it was the probe,
+        another probe is allowed.
+        """
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+
+    def record_failure(self) -> None:
+        """Register a failed request."""
+        self.failures += 1
+
+        if self.state == STATE_HALF_OPEN or self.failures >= self.FAILURE_THRESHOLD:
+            self.state = STATE_OPEN
+            self.retry_at = dt_util.utcnow() + self.backoff()
+
+            _LOGGER.warning(
+                "API requests failed %d time(s) in a row, circuit open until %s.",
+                self.failures,
+                self.retry_at,
+            )
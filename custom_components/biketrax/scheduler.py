@@ -0,0 +1,76 @@
+"""Domain-wide scheduling of BikeTrax updates."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER, DOMAIN
+
+
+class DomainScheduler:
+    """Spread the updates of all accounts over time.
+
+    Every account is assigned a fixed offset within each update interval,
+    derived from a hash of its key. The offset does not depend on the other
+    accounts, so it remains the same when accounts are added or removed.
+    Updates are aligned to these offsets, so accounts rarely update at the
+    same time. In addition, the number of updates that run at once is limited.
+    """
+
+    # Maximum number of account updates that run at the same time.
+    MAX_CONCURRENT_UPDATES = 4
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_UPDATES)
+
+    @staticmethod
+    def offset(key: str) -> float:
+        """Return the offset of an account, as a fraction of an interval."""
+        digest = hashlib.sha256(key.encode()).digest()
+
+        return int.from_bytes(digest[:8]) / 2**64
+
+    def align(
+        self,
+        key: str,
+        interval: timedelta,
+        maximum: timedelta | None = None,
+    ) -> timedelta:
+        """Return the delay until the slot of an account.
+
+        The slot is the moment closest to `interval` from now at which the
+        offset of the account within the interval is reached. If that is
+        later than `maximum`, the slot before it is used instead.
+        """
+        period = interval.total_seconds()
+
+        if period <= 0:
+            return interval
+
+        delay = (self.offset(key) * period - dt_util.utcnow().timestamp()) % period
+
+        if delay < period / 2:
+            delay += period
+
+        if maximum is not None and delay > maximum.total_seconds():
+            delay -= period
+
+        return timedelta(seconds=delay)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> DomainScheduler:
+    """Return the domain-wide scheduler, creating it if necessary."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = DomainScheduler(hass)
+
+    return domain_data[DATA_SCHEDULER]
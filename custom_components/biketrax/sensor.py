@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from typing import cast
 
 from aiobiketrax import Device
@@ -14,15 +16,17 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfLength, UnitOfSpeed
+from homeassistant.const import PERCENTAGE, UnitOfLength, UnitOfSpeed, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from . import BikeTraxBaseEntity
+from . import BikeTraxAccountEntity, BikeTraxBaseEntity
 from .const import DATA_DEVICE, DATA_SUBSCRIPTION, DOMAIN
-from .coordinator import BikeTraxDataUpdateCoordinator
+from .coordinator import BikeTraxDataUpdateCoordinator, DeviceDataUpdateCoordinator
+from .latency import PATH_POLL, PATH_PUSH, STAGE_RECEIVE, STAGE_WRITE
+from .retry import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
 
 
 @dataclass
@@ -41,6 +45,20 @@ class BikeTraxSensorEntityDescription(
     attribute: str | None = None
 
 
+@dataclass
+class BikeTraxAccountRequiredKeysMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[DeviceDataUpdateCoordinator], StateType | datetime]
+
+
+@dataclass
+class BikeTraxAccountSensorEntityDescription(
+    SensorEntityDescription, BikeTraxAccountRequiredKeysMixin
+):
+    """Describes BikeTrax account sensor entity."""
+
+
 SENSOR_TYPES: tuple[BikeTraxSensorEntityDescription, ...] = (
     BikeTraxSensorEntityDescription(
         coordinator=DATA_DEVICE,
@@ -113,6 +131,163 @@ SENSOR_TYPES: tuple[BikeTraxSensorEntityDescription, ...] = (
     ),
 )
 
+ACCOUNT_SENSOR_TYPES: tuple[BikeTraxAccountSensorEntityDescription, ...] = (
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:message-arrow-left",
+        key="push_last_message",
+        name="Push last message",
+        value_fn=lambda c: c.push_health.last_message,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:message-fast-outline",
+        key="push_message_rate",
+        name="Push messages per minute",
+        native_unit_of_measurement="messages/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: round(c.push_health.message_rate.per_minute, 1),
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:connection",
+        key="push_reconnects",
+        name="Push reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.push_health.reconnects,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.ENUM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:electric-switch",
+        key="api_circuit",
+        name="API circuit breaker",
+        options=[STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN],
+        value_fn=lambda c: c.retry_policy.state,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:alert-circle-outline",
+        key="api_failures",
+        name="API consecutive failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: c.retry_policy.failures,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:api",
+        key="api_requests",
+        name="API requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: sum(c.api_metrics.requests.values()),
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:tray-full",
+        key="api_max_queue_depth",
+        name="API maximum queue depth",
+        value_fn=lambda c: c.rate_limiter.max_queue_depth,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-sand",
+        key="api_average_wait",
+        name="API average wait time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: round(c.rate_limiter.average_wait * 1000.0),
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-sand-full",
+        key="api_max_wait",
+        name="API maximum wait time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda c: round(c.rate_limiter.max_wait * 1000.0),
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:timer-outline",
+        key="command_latency",
+        name="Command latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: (
+            round(c.last_command_latency * 1000.0)
+            if c.last_command_latency is not None
+            else None
+        ),
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:call-merge",
+        key="commands_coalesced",
+        name="Commands coalesced",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.commands_coalesced,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:map-marker-off",
+        key="suppressed_jitter",
+        name="Location updates ignored",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.suppressed_jitter,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:login",
+        key="auth_logins",
+        name="Logins",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.token_store.logins,
+    ),
+    BikeTraxAccountSensorEntityDescription(
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:key-chain",
+        key="auth_token_reuses",
+        name="Login token reuses",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.token_store.reused,
+    ),
+)
+
+
+def _latency_value_fn(
+    stage: str, path: str, statistic: str
+) -> Callable[[DeviceDataUpdateCoordinator], StateType]:
+    """Return a function that reads a latency statistic, in seconds."""
+
+    def _value_fn(coordinator: DeviceDataUpdateCoordinator) -> StateType:
+        value = getattr(coordinator.latency.windows[stage, path], statistic)
+
+        return round(value, 1) if value is not None else None
+
+    return _value_fn
+
+
+LATENCY_SENSOR_TYPES: tuple[BikeTraxAccountSensorEntityDescription, ...] = tuple(
+    BikeTraxAccountSensorEntityDescription(
+        device_class=SensorDeviceClass.DURATION,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-sync-outline",
+        key=f"latency_{stage}_{path}_{statistic}",
+        name=f"{stage.capitalize()} latency ({path}) {statistic}",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_latency_value_fn(stage, path, statistic),
+    )
+    for stage in (STAGE_RECEIVE, STAGE_WRITE)
+    for path in (PATH_POLL, PATH_PUSH)
+    for statistic in ("p50", "p95", "max")
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -125,12 +300,17 @@ async def async_setup_entry(
         config_entry.entry_id
     ]
 
-    entities = [
+    entities: list[SensorEntity] = [
         BikeTraxSensor(coordinators[description.coordinator], device, description)
         for description in SENSOR_TYPES
         for device in coordinators[description.coordinator].account.devices
     ]
 
+    entities.extend(
+        BikeTraxAccountSensor(coordinators[DATA_DEVICE], config_entry, description)
+        for description in ACCOUNT_SENSOR_TYPES + LATENCY_SENSOR_TYPES
+    )
+
     async_add_entities(entities)
 
 
@@ -163,3 +343,27 @@ class BikeTraxSensor(BikeTraxBaseEntity, SensorEntity):
                 self.entity_description.attribute or self.entity_description.key,
             ),
         )
+
+
+class BikeTraxAccountSensor(BikeTraxAccountEntity, SensorEntity):
+    """Representation of a BikeTrax account sensor."""
+
+    entity_description: BikeTraxAccountSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DeviceDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: BikeTraxAccountSensorEntityDescription,
+    ) -> None:
+        """Initialize BikeTrax account sensor."""
+        super().__init__(coordinator, entry)
+
+        self.entity_description = description
+
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}-{description.key}"
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        return self.entity_description.value_fn(self.coordinator)
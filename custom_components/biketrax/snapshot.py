@@ -0,0 +1,95 @@
+"""Snapshots of BikeTrax account data."""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime
+from typing import Any
+
+from aiobiketrax import Account, models
+
+# Time to wait before persisting a snapshot, so bursts of updates result in a
+# single write.
+SNAPSHOT_SAVE_DELAY = 60
+
+# Version of the snapshot format. Snapshots of other versions are ignored.
+SNAPSHOT_VERSION = 2
+
+
+def _encode(value: Any) -> Any:
+    """Return a JSON-serializable representation of a field value."""
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Return the field value of a representation created by `_encode`."""
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["datetime"])
+
+    return value
+
+
+def _subscription_to_dict(subscription: models.Subscription) -> dict[str, Any]:
+    """Return the fields of a subscription.
+
+    `Subscription.from_dict` of aiobiketrax passes some fields in the wrong
+    order, so the subscriptions it creates cannot be serialized with
+    `Subscription.to_dict`. The fields are stored as they are instead.
+    """
+    return {
+        field.name: _encode(getattr(subscription, field.name))
+        for field in dataclasses.fields(subscription)
+    }
+
+
+def _subscription_from_dict(obj: dict[str, Any]) -> models.Subscription:
+    """Return a subscription created by `_subscription_to_dict`."""
+    return models.Subscription(**{name: _decode(value) for name, value in obj.items()})
+
+
+def create_snapshot(account: Account) -> dict[str, Any]:
+    """Create a snapshot of the device, position and subscription data.
+
+    The snapshot only contains JSON-serializable data, so it can be persisted
+    in a `Store`.
+    """
+    return {
+        "version": SNAPSHOT_VERSION,
+        "devices": [device.to_dict() for device in account._devices.values()],
+        "positions": [
+            position.to_dict()
+            for position in account._positions.values()
+            if position is not None
+        ],
+        "subscriptions": {
+            str(device_id): _subscription_to_dict(subscription)
+            for device_id, subscription in account._subscriptions.items()
+            if subscription is not None
+        },
+    }
+
+
+def restore_snapshot(account: Account, snapshot: dict[str, Any]) -> None:
+    """Restore the device, position and subscription data from a snapshot.
+
+    The account is left untouched if the snapshot cannot be parsed.
+    """
+    devices = {
+        device.id: device
+        for device in map(models.Device.from_dict, snapshot["devices"])
+    }
+    positions = {
+        position.device_id: position
+        for position in map(models.Position.from_dict, snapshot["positions"])
+    }
+    subscriptions = {
+        int(device_id): _subscription_from_dict(subscription)
+        for device_id, subscription in snapshot["subscriptions"].items()
+    }
+
+    account._devices = devices
+    account._positions = positions
+    account._subscriptions = subscriptions
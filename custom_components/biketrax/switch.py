@@ -15,7 +15,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.unit_system import UnitSystem
 
 from . import BikeTraxBaseEntity
-from .const import DATA_DEVICE, DOMAIN
+from .command import OptimisticCommand
+from .const import CONF_READ_ONLY, DATA_DEVICE, DOMAIN
 from .coordinator import BikeTraxDataUpdateCoordinator
 
 
@@ -68,8 +69,13 @@ async def async_setup_entry(
         config_entry.entry_id
     ]
 
+    # Read-only mode applies per config entry, even if the account is shared.
+    read_only = config_entry.options.get(CONF_READ_ONLY, False)
+
     entities = [
-        BikeTraxBinarySensor(coordinators[description.coordinator], device, description)
+        BikeTraxBinarySensor(
+            coordinators[description.coordinator], device, description, read_only
+        )
         for description in SWITCH_TYPES
         for device in coordinators[description.coordinator].account.devices
     ]
@@ -87,29 +93,43 @@ class BikeTraxBinarySensor(BikeTraxBaseEntity, SwitchEntity):
         coordinator: BikeTraxDataUpdateCoordinator,
         device: Device,
         description: BikeTraxBinarySwitchEntityDescription,
+        read_only: bool,
     ) -> None:
         """Initialize switch."""
         super().__init__(coordinator, device)
 
         self.entity_description = description
+        self._read_only = read_only
         self.entity_id = f"{SWITCH_DOMAIN}.{DOMAIN}_{description.key}_{device.id}"
 
         self._attr_name = f"{device.name} {description.name}"
         self._attr_unique_id = f"{device.id}-{description.key}"
 
+        self._command = OptimisticCommand(
+            coordinator,
+            lambda value: description.set_fn(device, value),
+            self.async_write_ha_state,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """When entity will be removed from hass."""
+        await super().async_will_remove_from_hass()
+        self._command.async_shutdown()
+
     @property
     def is_on(self) -> bool:
         """Return the status of the switch."""
+        if self._command.desired is not None:
+            return self._command.desired
+
         return self.entity_description.get_fn(self.device)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        if not self.coordinator.read_only:
-            await self.entity_description.set_fn(self.device, True)
-            self.async_write_ha_state()
+        if not self._read_only:
+            await self._command.async_set(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
-        if not self.coordinator.read_only:
-            await self.entity_description.set_fn(self.device, False)
-            self.async_write_ha_state()
+        if not self._read_only:
+            await self._command.async_set(False)
@@ -0,0 +1,186 @@
+"""Fixtures for the BikeTrax benchmarks."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.biketrax.const import CONF_COALESCE_WINDOW, DOMAIN
+
+from ..fleet import Fleet
+from .fake import FakeAccount
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+# Fleet sizes to benchmark.
+FLEET_SIZES = (1, 50, 500)
+
+# Factor by which a result per device or per update of the largest fleet may
+# exceed that of the smallest fleet with multiple devices.
+SCALING_TOLERANCE = 3.0
+
+
+class Baseline:
+    """Compare benchmark results with the stored baselines.
+
+    Counters (API calls, entities, state writes) are deterministic, so they
+    must match their baseline exactly. A counter without a baseline fails,
+    unless the baselines are being updated.
+
+    Timings and memory usage depend on the machine, so they are stored for
+    information only. Instead, their growth with the size of the fleet is
+    checked within a run, see `check_scaling`.
+    """
+
+    def __init__(self, update: bool) -> None:
+        """Initialize the baselines."""
+        self.update = update
+        self.baselines: dict[str, dict[str, float]] = (
+            json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+        )
+        self.results: dict[str, dict[str, float]] = {}
+
+    def check(self, name: str, metric: str, value: float) -> None:
+        """Record a counter, and compare it with its baseline."""
+        self.results.setdefault(name, {})[metric] = value
+
+        if self.update:
+            return
+
+        baseline = self.baselines.get(name, {}).get(metric)
+
+        assert (
+            baseline is not None
+        ), f"{name} {metric}: no baseline, store one with --update-baselines"
+
+        assert value == baseline, f"{name} {metric}: {value} != {baseline}"
+
+    def record(self, name: str, metric: str, value: float) -> None:
+        """Record a result, without comparing it with its baseline."""
+        self.results.setdefault(name, {})[metric] = value
+
+    def check_scaling(self, benchmark: str, metric: str) -> None:
+        """Compare a result per device or per update between fleet sizes.
+
+        The result of the largest fleet may exceed that of the smallest fleet
+        with multiple devices by `SCALING_TOLERANCE`, i.e. the cost must grow
+        about linearly with the fleet. The check is skipped if either result
+        was not recorded in this run.
+        """
+        small, large = (
+            self.results.get(f"{benchmark}[{size}]", {}).get(metric)
+            for size in (FLEET_SIZES[1], FLEET_SIZES[-1])
+        )
+
+        if small is None or large is None:
+            return
+
+        assert large <= small * SCALING_TOLERANCE, (
+            f"{benchmark} {metric}: {large:.4g} for {FLEET_SIZES[-1]} devices "
+            f"exceeds {small:.4g} for {FLEET_SIZES[1]} devices"
+        )
+
+    def save(self) -> None:
+        """Store the results as the new baselines."""
+        self.baselines.update(self.results)
+
+        BASELINES.write_text(
+            json.dumps(self.baselines, indent=2, sort_keys=True) + "\n"
+        )
+
+
+@pytest.fixture(scope="session")
+def baseline(request: pytest.FixtureRequest) -> Generator[Baseline]:
+    """Return the baselines, and store the results if requested."""
+    baseline = Baseline(request.config.getoption("--update-baselines"))
+
+    yield baseline
+
+    if baseline.update:
+        baseline.save()
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading of this custom integration."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow delayed writes of storage that are pending after unloading."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Allow the stand-in server to close its connections after the test."""
+    return True
+
+
+@pytest.fixture(params=FLEET_SIZES, ids=lambda size: f"{size}-devices")
+def fleet(request: pytest.FixtureRequest) -> Fleet:
+    """Return a synthetic fleet."""
+    return Fleet(request.param)
+
+
+async def async_setup_fleet(
+    hass: HomeAssistant, fleet: Fleet, options: dict[str, Any] | None = None
+) -> tuple[MockConfigEntry, FakeAccount]:
+    """Set up the integration with an account that serves a fleet.
+
+    Pushed updates are not coalesced, unless requested by `options`.
+    """
+    accounts: list[FakeAccount] = []
+
+    def _account(username: str, password: str, session: Any) -> FakeAccount:
+        accounts.append(FakeAccount(fleet, username, password, session))
+        return accounts[-1]
+
+    entry = _mock_entry(hass, options)
+
+    with patch("custom_components.biketrax.Account", _account):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    return entry, accounts[0]
+
+
+async def async_setup_standin(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Set up the integration with an account that uses a stand-in server.
+
+    Unlike `async_setup_fleet`, all requests go over HTTP, through the rate
+    limiter of the integration. Must be called within the context of
+    `StandInServer.patch_account`, which has to stay active until the entry is
+    unloaded.
+    """
+    entry = _mock_entry(hass, options)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    return entry
+
+
+def _mock_entry(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Add a config entry, without coalescing of pushed updates by default."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="BikeTrax benchmark",
+        data={CONF_USERNAME: "benchmark@example.com", CONF_PASSWORD: "secret"},
+        options={CONF_COALESCE_WINDOW: 0, **(options or {})},
+    )
+    entry.add_to_hass(hass)
+
+    return entry
@@ -0,0 +1,111 @@
+"""In-memory stand-in of the PowUnity API, backed by a synthetic fleet."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+from aiobiketrax import Account, models
+
+from ..fleet import Fleet
+
+
+class FakeTraccarApi:
+    """Serve the Traccar API from a fleet."""
+
+    def __init__(self, fleet: Fleet) -> None:
+        """Initialize the API."""
+        self.fleet = fleet
+        self.calls = 0
+        self.updates: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def get_devices(self) -> list[models.Device]:
+        self.calls += 1
+        return [
+            models.device_from_dict(device) for device in self.fleet.devices.values()
+        ]
+
+    async def put_device(self, id: int, device: models.Device) -> models.Device:
+        self.calls += 1
+        self.fleet.devices[id] = device.to_dict()
+        return device
+
+    async def get_position(self, device_id: int, id: int) -> models.Position | None:
+        self.calls += 1
+        position = self.fleet.positions.get(device_id)
+        return models.position_from_dict(position) if position else None
+
+    async def get_trips(
+        self, device_id: int, from_date: datetime, to_date: datetime
+    ) -> list[models.Trip]:
+        self.calls += 1
+        return [
+            models.trip_from_dict(trip)
+            for trip in self.fleet.trips_between(device_id, from_date, to_date)
+        ]
+
+    async def create_socket(self) -> AsyncIterator[models.Position | models.Device]:
+        """Yield the updates that are pushed with `push`."""
+        while True:
+            message = models.web_socket_update_from_dict(await self.updates.get())
+
+            for position in message.positions or []:
+                yield position
+
+            for device in message.devices or []:
+                yield device
+
+    def push(self, message: dict[str, Any]) -> None:
+        """Push a websocket message."""
+        self.updates.put_nowait(message)
+
+
+class FakeAdminApi:
+    """Serve the admin API from a fleet."""
+
+    def __init__(self, fleet: Fleet) -> None:
+        """Initialize the API."""
+        self.fleet = fleet
+        self.calls = 0
+
+    async def post_arm(self, unique_id: str) -> None:
+        self.calls += 1
+        self.fleet.set_guarded(unique_id, True)
+
+    async def post_disarm(self, unique_id: str) -> None:
+        self.calls += 1
+        self.fleet.set_guarded(unique_id, False)
+
+    async def get_subscription(self, unique_id: str) -> models.Subscription | None:
+        self.calls += 1
+        subscription = self.fleet.subscriptions.get(unique_id)
+        return models.subscription_from_dict(subscription) if subscription else None
+
+
+class FakeAccount(Account):
+    """Account that is served from a fleet, without network access."""
+
+    traccar_api: FakeTraccarApi
+    admin_api: FakeAdminApi
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        username: str,
+        password: str,
+        session: aiohttp.ClientSession,
+    ) -> None:
+        """Initialize the account."""
+        super().__init__(username, password, session)
+
+        self.identity_api.id_token = {"traccarPassword": password}
+        self.traccar_api = FakeTraccarApi(fleet)
+        self.admin_api = FakeAdminApi(fleet)
+
+    @property
+    def calls(self) -> int:
+        """Return the number of API calls."""
+        return self.traccar_api.calls + self.admin_api.calls
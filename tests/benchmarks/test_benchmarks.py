@@ -0,0 +1,139 @@
+"""Benchmarks of the BikeTrax integration with a synthetic fleet.
+
+Run with `pytest tests/benchmarks --benchmark`. Add `--update-baselines` to
+store the results as the new baselines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.biketrax import PLATFORMS
+from custom_components.biketrax.const import (
+    DATA_DEVICE,
+    DATA_SUBSCRIPTION,
+    DATA_TRIP,
+    DOMAIN,
+)
+
+from ..fleet import Fleet
+from .conftest import Baseline, async_setup_fleet
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+
+async def test_setup(hass: HomeAssistant, fleet: Fleet, baseline: Baseline) -> None:
+    """Benchmark the setup of a config entry, and the entities it creates."""
+    name = f"setup[{len(fleet.devices)}]"
+
+    start = time.perf_counter()
+    entry, account = await async_setup_fleet(hass, fleet)
+    duration = time.perf_counter() - start
+
+    baseline.record(name, "duration", duration)
+    baseline.record(name, "duration_per_device", duration / len(fleet.devices))
+    baseline.check_scaling("setup", "duration_per_device")
+
+    baseline.check(name, "api_calls", account.calls)
+
+    for platform in PLATFORMS:
+        baseline.check(
+            name,
+            f"entities_{platform}",
+            len(hass.states.async_entity_ids(platform)),
+        )
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_memory(hass: HomeAssistant, fleet: Fleet, baseline: Baseline) -> None:
+    """Benchmark the memory that is allocated per device during setup."""
+    name = f"memory[{len(fleet.devices)}]"
+
+    tracemalloc.start()
+
+    try:
+        entry, _ = await async_setup_fleet(hass, fleet)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    baseline.record(name, "bytes_per_device", allocated / len(fleet.devices))
+    baseline.check_scaling("memory", "bytes_per_device")
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_refresh(hass: HomeAssistant, fleet: Fleet, baseline: Baseline) -> None:
+    """Benchmark a refresh of each coordinator after all devices moved."""
+    name = f"refresh[{len(fleet.devices)}]"
+
+    entry, account = await async_setup_fleet(hass, fleet)
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+
+    for device_id in fleet.device_ids:
+        fleet.move(device_id, fleet.now + timedelta(minutes=1))
+
+    for key in (DATA_DEVICE, DATA_TRIP, DATA_SUBSCRIPTION):
+        coordinator = coordinators[key]
+        calls = account.calls
+        state_writes = coordinator.state_writes
+
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        duration = time.perf_counter() - start
+
+        baseline.record(name, f"{key}_duration", duration)
+        baseline.record(
+            name, f"{key}_duration_per_device", duration / len(fleet.devices)
+        )
+        baseline.check_scaling("refresh", f"{key}_duration_per_device")
+
+        baseline.check(name, f"{key}_api_calls", account.calls - calls)
+        baseline.check(
+            name, f"{key}_state_writes", coordinator.state_writes - state_writes
+        )
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_push_fanout(
+    hass: HomeAssistant, fleet: Fleet, baseline: Baseline
+) -> None:
+    """Benchmark processing a pushed position update of every device."""
+    name = f"push[{len(fleet.devices)}]"
+
+    entry, account = await async_setup_fleet(hass, fleet)
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+    messages = coordinator.push_health.messages
+    state_writes = coordinator.state_writes
+
+    start = time.perf_counter()
+
+    for device_id in fleet.device_ids:
+        account.traccar_api.push(
+            {"positions": [fleet.move(device_id, fleet.now + timedelta(minutes=1))]}
+        )
+
+    while coordinator.push_health.messages - messages < len(fleet.devices):
+        await asyncio.sleep(0)
+
+    await hass.async_block_till_done()
+
+    duration = time.perf_counter() - start
+
+    baseline.record(name, "duration", duration)
+    baseline.record(name, "duration_per_update", duration / len(fleet.devices))
+    baseline.check_scaling("push", "duration_per_update")
+
+    baseline.check(name, "state_writes", coordinator.state_writes - state_writes)
+
+    await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,88 @@
+"""Replay of a captured busy period, to measure CPU time and state writes.
+
+Run with `pytest tests/benchmarks --benchmark -s --replay <file>`. Add
+`--replay-speed <factor>` to replay faster than real time. Pushed updates are
+replayed at the given speed, while the coordinators keep polling at their
+usual intervals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.biketrax.const import (
+    DATA_DEVICE,
+    DATA_SUBSCRIPTION,
+    DATA_TRIP,
+    DOMAIN,
+)
+
+from ..replay import Capture, ReplayServer
+from .conftest import Baseline, async_setup_standin
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.benchmark,
+    pytest.mark.usefixtures("socket_enabled"),
+]
+
+# Time (in seconds) the replay may take longer than the capture.
+MARGIN = 60.0
+
+
+async def test_replay(
+    hass: HomeAssistant, request: pytest.FixtureRequest, baseline: Baseline
+) -> None:
+    """Replay a capture, and measure the work it causes."""
+    if not (path := request.config.getoption("--replay")):
+        pytest.skip("No capture to replay, use --replay.")
+
+    capture = Capture(path)
+    speed = request.config.getoption("--replay-speed")
+    name = f"replay[{Path(path).stem}]"
+
+    async with ReplayServer(capture, speed=speed) as server:
+        with server.patch_account():
+            entry = await async_setup_standin(hass)
+            coordinators = [
+                hass.data[DOMAIN][entry.entry_id][key]
+                for key in (DATA_DEVICE, DATA_TRIP, DATA_SUBSCRIPTION)
+            ]
+
+            state_writes = sum(coordinator.state_writes for coordinator in coordinators)
+            messages = coordinators[0].push_health.messages
+
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+
+            await asyncio.wait_for(
+                server.finished.wait(), capture.duration / speed + MARGIN
+            )
+            await hass.async_block_till_done()
+
+            duration = time.perf_counter() - start
+            cpu_time = time.process_time() - cpu_start
+            state_writes = (
+                sum(coordinator.state_writes for coordinator in coordinators)
+                - state_writes
+            )
+            processed = coordinators[0].push_health.messages - messages
+
+            baseline.record(name, "duration", duration)
+            baseline.record(name, "cpu_time", cpu_time)
+            baseline.record(name, "pushed", server.pushed)
+            baseline.record(name, "processed", processed)
+            baseline.record(name, "state_writes", state_writes)
+
+            print(
+                f"Replayed {server.pushed} pushed update(s) in {duration:.1f}s: "
+                f"{cpu_time:.2f}s CPU, {processed} processed, "
+                f"{state_writes} state write(s)"
+            )
+
+            await hass.config_entries.async_unload(entry.entry_id)
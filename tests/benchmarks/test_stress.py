@@ -0,0 +1,154 @@
+"""Stress tests of the BikeTrax integration against a stand-in server.
+
+Run with `pytest tests/benchmarks --benchmark -s`, to see where throughput
+collapses. Unlike the benchmarks, all requests go over HTTP to a local server,
+so connection handling and rate limiting are part of the measurements.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.biketrax.const import DATA_DEVICE, DOMAIN
+from custom_components.biketrax.latency import PATH_PUSH, STAGE_WRITE
+
+from ..fleet import Fleet
+from ..standin import StandInServer
+from .conftest import Baseline, async_setup_standin
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.benchmark,
+    pytest.mark.usefixtures("socket_enabled"),
+]
+
+# Push rates (updates per second) to step through, until throughput collapses.
+PUSH_RATES = (10, 30, 100, 300, 1000, 3000)
+
+# Duration of each step, in seconds.
+STEP = 3.0
+
+# Time (in seconds) to wait for the push channel to connect.
+CONNECT_TIMEOUT = 10.0
+
+# Fraction of the pushed updates that must be processed to keep up.
+KEEP_UP = 0.9
+
+# Each pushed update consists of a message with the device, and a message with
+# its position.
+MESSAGES_PER_UPDATE = 2
+
+
+async def test_push_throughput(hass: HomeAssistant, baseline: Baseline) -> None:
+    """Step up the push rate until updates are no longer processed in time."""
+    fleet = Fleet(50)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await async_setup_standin(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+            window = coordinator.latency.windows[STAGE_WRITE, PATH_PUSH]
+
+            # The push channel connects in the background, after setup.
+            async with asyncio.timeout(CONNECT_TIMEOUT):
+                while not coordinator.push_health.connected:
+                    await asyncio.sleep(0.1)
+
+            collapse_rate = None
+
+            for push_rate in PUSH_RATES:
+                name = f"stress_push[{push_rate}]"
+
+                server.push_rate = push_rate
+                pushed = server.pushed
+                messages = coordinator.push_health.messages
+                start = time.perf_counter()
+
+                await asyncio.sleep(STEP)
+
+                duration = time.perf_counter() - start
+                pushed = server.pushed - pushed
+                processed = (
+                    coordinator.push_health.messages - messages
+                ) // MESSAGES_PER_UPDATE
+
+                baseline.record(name, "pushed_per_second", pushed / duration)
+                baseline.record(name, "processed_per_second", processed / duration)
+                baseline.record(name, "write_latency_p95", window.p95 or 0.0)
+
+                print(
+                    f"{push_rate:>5}/s: pushed {pushed / duration:.0f}/s, "
+                    f"processed {processed / duration:.0f}/s, "
+                    f"p95 write latency {window.p95 or 0.0:.3f}s"
+                )
+
+                # The server shares the event loop with Home Assistant, so a
+                # busy loop also slows down pushing.
+                if processed < pushed * KEEP_UP or pushed < push_rate * STEP * KEEP_UP:
+                    collapse_rate = push_rate
+                    break
+
+            server.push_rate = 0
+
+            baseline.record("stress_push", "collapse_rate", collapse_rate or 0)
+
+            # The lowest rate is well within what a real account pushes.
+            assert collapse_rate != PUSH_RATES[0]
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("latency", (0.0, 0.05, 0.2))
+async def test_refresh_latency(
+    hass: HomeAssistant, baseline: Baseline, latency: float
+) -> None:
+    """Measure the duration of a device refresh with a slow server."""
+    name = f"stress_refresh[{latency}]"
+    fleet = Fleet(10)
+
+    async with StandInServer(fleet, latency=latency) as server:
+        with server.patch_account():
+            entry = await async_setup_standin(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+            for device_id in fleet.device_ids:
+                fleet.move(device_id)
+
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            baseline.record(name, "duration", time.perf_counter() - start)
+
+            assert coordinator.last_update_success
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_errors_and_disconnects(hass: HomeAssistant) -> None:
+    """Check that the integration recovers from errors and disconnects."""
+    fleet = Fleet(10)
+
+    async with StandInServer(fleet, push_rate=10, disconnect_after=1.0) as server:
+        with server.patch_account():
+            entry = await async_setup_standin(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+            # Refreshes fail while the server returns errors.
+            server.error_rate = 1.0
+            await coordinator.async_refresh()
+            assert not coordinator.last_update_success
+
+            # The push channel reconnects after each disconnect.
+            server.error_rate = 0.0
+            await asyncio.sleep(3 * server.disconnect_after)
+            assert coordinator.push_health.connects > 1
+
+            # A single failure does not open the circuit, so refreshes succeed
+            # right away.
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+
+            await hass.config_entries.async_unload(entry.entry_id)
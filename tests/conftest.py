@@ -0,0 +1,64 @@
+"""Configuration of the BikeTrax tests."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# Most tests run in a Home Assistant test instance, which is provided by
+# `pytest-homeassistant-custom-component`. Without it, only the tests that do
+# not need Home Assistant are collected.
+STANDALONE = ["test_dummy.py"]
+
+collect_ignore = (
+    []
+    if importlib.util.find_spec("pytest_homeassistant_custom_component")
+    else [
+        "benchmarks",
+        *(
+            path.name
+            for path in Path(__file__).parent.glob("test_*.py")
+            if path.name not in STANDALONE
+        ),
+    ]
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    parser.addoption("--benchmark", action="store_true", help="Run the benchmarks.")
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Store the benchmark results as the new baselines.",
+    )
+    parser.addoption("--replay", help="Capture of API traffic to replay.")
+    parser.addoption(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Factor to speed up the replay with.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the benchmark marker."""
+    config.addinivalue_line(
+        "markers", "benchmark: benchmark, only runs with --benchmark"
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks, unless requested."""
+    if config.getoption("--benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="Benchmarks only run with --benchmark.")
+
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
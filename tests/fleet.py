@@ -0,0 +1,174 @@
+"""Synthetic fleet of BikeTrax devices.
+
+The fleet holds the API representation (as returned by the PowUnity API) of
+devices, positions, subscriptions and trips. It is generated from a seed, so
+the same size and seed always result in the same fleet. Timestamps are
+relative to the time of generation.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+# Center of the area in which the devices are placed.
+CENTER = (47.2692, 11.4041)
+
+
+def _isoformat(value: datetime) -> str:
+    """Format a timestamp like the API does."""
+    return value.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+class Fleet:
+    """Synthetic fleet of devices."""
+
+    def __init__(self, size: int, seed: int = 0, now: datetime | None = None) -> None:
+        """Generate a fleet of `size` devices."""
+        self.random = random.Random(seed)
+        self.now = now or datetime.now(timezone.utc).replace(microsecond=0)
+
+        self.devices: dict[int, dict[str, Any]] = {}
+        self.positions: dict[int, dict[str, Any]] = {}
+        self.subscriptions: dict[str, dict[str, Any]] = {}
+        self.trips: dict[int, list[dict[str, Any]]] = {}
+
+        self._position_id = 0
+
+        for index in range(size):
+            self._add_device(1000 + index)
+
+    @property
+    def device_ids(self) -> list[int]:
+        """Return the identifiers of all devices."""
+        return list(self.devices)
+
+    def _add_device(self, device_id: int) -> None:
+        """Generate a device, its position, subscription and trips."""
+        unique_id = f"{self.random.randrange(10**14, 10**15)}"
+        last_update = self.now - timedelta(minutes=self.random.randrange(0, 720))
+
+        self.devices[device_id] = {
+            "attributes": {
+                "alarm": False,
+                "autoGuard": self.random.random() < 0.5,
+                "fwVersion": "3.1.4",
+                "geofenceRadius": 50,
+                "guarded": self.random.random() < 0.5,
+                "guardType": "motion",
+                "stolen": False,
+            },
+            "disabled": False,
+            "geofenceIds": [],
+            "groupId": 1,
+            "id": device_id,
+            "lastUpdate": _isoformat(last_update),
+            "name": f"Bike {device_id}",
+            "positionId": 0,
+            "status": self.random.choice(["online", "offline"]),
+            "uniqueId": unique_id,
+        }
+        self.subscriptions[unique_id] = {
+            "category": "premium",
+            "createdAt": _isoformat(self.now - timedelta(days=300)),
+            "id": device_id,
+            "uniqueId": unique_id,
+            "updatedAt": _isoformat(self.now - timedelta(days=30)),
+            "trialEnd": _isoformat(
+                self.now + timedelta(days=self.random.randrange(1, 365))
+            ),
+        }
+        self.trips[device_id] = [
+            self._trip(device_id, self.now - timedelta(days=day, hours=2))
+            for day in range(1, 4)
+        ]
+
+        self.move(device_id, last_update)
+
+    def _trip(self, device_id: int, start: datetime) -> dict[str, Any]:
+        """Generate a trip."""
+        duration = self.random.randrange(600, 3600)
+        distance = float(self.random.randrange(1000, 20000))
+
+        return {
+            "averageSpeed": distance / duration * 1.943844,
+            "deviceId": device_id,
+            "deviceName": f"Bike {device_id}",
+            "distance": distance,
+            "duration": duration * 1000,
+            "endLat": CENTER[0] + self.random.uniform(-0.05, 0.05),
+            "endLon": CENTER[1] + self.random.uniform(-0.05, 0.05),
+            "endOdometer": 0.0,
+            "endPositionId": 0,
+            "endTime": _isoformat(start + timedelta(seconds=duration)),
+            "maxSpeed": 15.0,
+            "spentFuel": 0.0,
+            "startLat": CENTER[0] + self.random.uniform(-0.05, 0.05),
+            "startLon": CENTER[1] + self.random.uniform(-0.05, 0.05),
+            "startOdometer": 0.0,
+            "startPositionId": 0,
+            "startTime": _isoformat(start),
+        }
+
+    def move(self, device_id: int, when: datetime | None = None) -> dict[str, Any]:
+        """Generate a new position of a device, and return it."""
+        when = when or self.now
+        previous = self.positions.get(device_id)
+
+        if previous is None:
+            latitude = CENTER[0] + self.random.uniform(-0.05, 0.05)
+            longitude = CENTER[1] + self.random.uniform(-0.05, 0.05)
+        else:
+            latitude = previous["latitude"] + self.random.uniform(-0.001, 0.001)
+            longitude = previous["longitude"] + self.random.uniform(-0.001, 0.001)
+
+        self._position_id += 1
+
+        position = {
+            "accuracy": float(self.random.randrange(3, 30)),
+            "altitude": 574.0,
+            "attributes": {
+                "batteryLevel": self.random.randrange(5, 100),
+                "charge": False,
+                "motion": previous is not None,
+                "totalDistance": float(self.random.randrange(10**5, 10**7)),
+            },
+            "course": float(self.random.randrange(0, 360)),
+            "deviceId": device_id,
+            "deviceTime": _isoformat(when),
+            "fixTime": _isoformat(when),
+            "id": self._position_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "outdated": False,
+            "protocol": "osmand",
+            "serverTime": _isoformat(when),
+            "speed": float(self.random.randrange(0, 15)),
+            "type": None,
+            "valid": True,
+        }
+
+        self.positions[device_id] = position
+        self.devices[device_id]["positionId"] = position["id"]
+        self.devices[device_id]["lastUpdate"] = _isoformat(when)
+
+        return position
+
+    def set_guarded(self, unique_id: str, guarded: bool) -> None:
+        """Arm or disarm a device."""
+        for device in self.devices.values():
+            if device["uniqueId"] == unique_id:
+                device["attributes"]["guarded"] = guarded
+
+    def trips_between(
+        self, device_id: int, from_date: datetime, to_date: datetime
+    ) -> list[dict[str, Any]]:
+        """Return the trips of a device that ended within a period."""
+        return [
+            trip
+            for trip in self.trips.get(device_id, [])
+            if from_date
+            <= datetime.fromisoformat(trip["endTime"].replace("Z", "+00:00"))
+            <= to_date
+        ]
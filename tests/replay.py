@@ -0,0 +1,165 @@
+"""Replay of captured BikeTrax traffic.
+
+Captures are made with the capture option of the integration (see
+`custom_components/biketrax/capture.py`). The replay server answers API
+requests with the captured responses, and pushes the captured updates over the
+websocket at their original pace, or accelerated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from yarl import URL
+
+from custom_components.biketrax.capture import KIND_API, KIND_PUSH, request_key
+
+from .standin import LocalServer
+
+
+class Capture:
+    """Captured traffic, loaded from a file."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Load a capture."""
+        # Times, statuses and bodies of the responses, by request key.
+        self.responses: dict[str, tuple[list[float], list[tuple[int, Any]]]] = {}
+        self.pushes: list[tuple[float, dict[str, Any]]] = []
+
+        times = []
+
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                times.append(record[0])
+
+                if record[1] == KIND_API:
+                    when, _, key, status, body = record
+                    responses = self.responses.setdefault(key, ([], []))
+                    responses[0].append(when)
+                    responses[1].append((status, body))
+                elif record[1] == KIND_PUSH:
+                    self.pushes.append((record[0], record[2]))
+
+        self.start = min(times, default=0.0)
+        self.end = max(times, default=0.0)
+
+    @property
+    def duration(self) -> float:
+        """Return the duration of the capture, in seconds."""
+        return self.end - self.start
+
+    def response(self, key: str, when: float) -> tuple[int, Any] | None:
+        """Return the latest response to a request at a time.
+
+        Requests made before the first captured response get that response.
+        """
+        if (responses := self.responses.get(key)) is None:
+            return None
+
+        index = bisect.bisect_right(responses[0], when) - 1
+
+        return responses[1][max(index, 0)]
+
+
+class ReplayServer(LocalServer):
+    """Serve captured traffic.
+
+    The replay clock starts when the first websocket connects, so the pushed
+    updates are not skipped while the integration sets up. API requests are
+    answered with the latest captured response at the replay time.
+    """
+
+    def __init__(self, capture: Capture, *, speed: float = 1.0) -> None:
+        """Initialize the server, replaying `speed` times faster than real time."""
+        super().__init__(web.Application())
+
+        self.capture = capture
+        self.speed = speed
+
+        self.pushed = 0
+        self.finished = asyncio.Event()
+
+        self._started: float | None = None
+        self._next_push = 0
+
+        self.app.router.add_get("/api/socket", self._socket)
+        self.app.router.add_route("*", "/{path:.*}", self._replay)
+
+    @property
+    def now(self) -> float:
+        """Return the replay time, in seconds since the epoch."""
+        if self._started is None:
+            return self.capture.start
+
+        return self.capture.start + (time.monotonic() - self._started) * self.speed
+
+    async def _replay(self, request: web.Request) -> web.Response:
+        """Answer a request with the captured response."""
+        path = request.path
+
+        # The admin endpoint is served from a different path, see
+        # `LocalServer.admin_endpoint`.
+        if path.startswith("/admin/"):
+            url = URL("https://admin.powunity.com/api" + path.removeprefix("/admin"))
+        else:
+            url = URL("https://traccar.powunity.com" + path)
+
+        response = self.capture.response(
+            request_key(request.method, url.with_query(request.query)), self.now
+        )
+
+        if response is None:
+            raise web.HTTPNotFound()
+
+        status, body = response
+
+        if body is None:
+            return web.Response(status=status)
+
+        return web.json_response(body, status=status)
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        """Push the captured updates, continuing where a previous socket ended."""
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+
+        self._websockets.add(websocket)
+
+        if self._started is None:
+            self._started = time.monotonic()
+
+        try:
+            while self._next_push < len(self.capture.pushes):
+                when, message = self.capture.pushes[self._next_push]
+
+                if (delay := (when - self.now) / self.speed) > 0:
+                    await asyncio.sleep(delay)
+
+                if websocket.closed:
+                    break
+
+                await websocket.send_json(message)
+
+                self._next_push += 1
+                self.pushed += 1
+            else:
+                self.finished.set()
+
+                # Keep the connection open until the client or server closes it.
+                async for _ in websocket:
+                    pass
+        finally:
+            self._websockets.discard(websocket)
+            await websocket.close()
+
+        return websocket
@@ -0,0 +1,275 @@
+"""Local stand-in of the PowUnity API and websocket, for load testing.
+
+The server serves a synthetic fleet over HTTP, and pushes position updates
+over the websocket at a configurable rate. Latency, errors and disconnects
+can be injected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any, Self
+from unittest.mock import patch
+
+from aiohttp import WSCloseCode, web
+
+from .fleet import Fleet
+
+
+class LocalServer:
+    """Local server that accounts can be pointed at."""
+
+    def __init__(self, app: web.Application) -> None:
+        """Initialize the server."""
+        self.app = app
+        self.url = ""
+
+        self._runner: web.AppRunner | None = None
+        self._websockets: set[web.WebSocketResponse] = set()
+
+    @property
+    def traccar_endpoint(self) -> str:
+        """Return the endpoint of the Traccar API."""
+        return f"{self.url}/api"
+
+    @property
+    def admin_endpoint(self) -> str:
+        """Return the endpoint of the admin API."""
+        return f"{self.url}/admin"
+
+    async def start(self) -> None:
+        """Start the server on a free local port."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        """Close all websockets and stop the server."""
+        for websocket in list(self._websockets):
+            await websocket.close(code=WSCloseCode.GOING_AWAY)
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> Self:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    @contextlib.contextmanager
+    def patch_account(self) -> Iterator[None]:
+        """Point all accounts at this server.
+
+        The login is replaced too, because the identity provider cannot be
+        served locally.
+        """
+
+        async def _login(identity_api: Any) -> None:
+            if identity_api.id_token is None:
+                identity_api.id_token = {
+                    "traccarPassword": identity_api.password,
+                    "exp": time.time() + 3600,
+                }
+
+        with (
+            patch("aiobiketrax.api.API_TRACCAR_ENDPOINT", self.traccar_endpoint),
+            patch("aiobiketrax.api.API_ADMIN_ENDPOINT", self.admin_endpoint),
+            patch("aiobiketrax.api.IdentityApi.login", _login),
+        ):
+            yield
+
+
+class StandInServer(LocalServer):
+    """Stand-in of the Traccar and admin API of PowUnity."""
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        *,
+        push_rate: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        disconnect_after: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server.
+
+        `push_rate` is the number of pushed updates per second, per websocket.
+        `latency` (in seconds) is added to every request. A fraction
+        `error_rate` of the requests fails with HTTP 500. Websockets are closed
+        after `disconnect_after` seconds, if set.
+        """
+        self.fleet = fleet
+        self.push_rate = push_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.disconnect_after = disconnect_after
+
+        self.random = random.Random(seed)
+
+        # Counters of requests by endpoint, errors and pushed updates.
+        self.requests: dict[str, int] = {}
+        self.errors = 0
+        self.pushed = 0
+        self.connects = 0
+
+        super().__init__(web.Application(middlewares=[self._middleware]))
+
+        self.app.router.add_get("/api/devices", self._get_devices)
+        self.app.router.add_put("/api/devices/{id}", self._put_device)
+        self.app.router.add_get("/api/positions", self._get_positions)
+        self.app.router.add_get("/api/reports/trips", self._get_trips)
+        self.app.router.add_post("/api/session", self._post_session)
+        self.app.router.add_get("/api/socket", self._socket)
+        self.app.router.add_get(
+            "/admin/subscriptions/{unique_id}", self._get_subscription
+        )
+        self.app.router.add_post("/admin/devices/{unique_id}/arm", self._post_arm)
+        self.app.router.add_post("/admin/devices/{unique_id}/disarm", self._post_disarm)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> Any:
+        """Count requests, and inject latency and errors."""
+        endpoint = request.match_info.route.resource.canonical
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            raise web.HTTPInternalServerError()
+
+        return await handler(request)
+
+    async def _get_devices(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.fleet.devices.values()))
+
+    async def _put_device(self, request: web.Request) -> web.Response:
+        device = await request.json()
+        self.fleet.devices[int(request.match_info["id"])] = device
+        return web.json_response(device)
+
+    async def _get_positions(self, request: web.Request) -> web.Response:
+        # Positions are queried by identifier, or by device and period. Only the
+        # latest position of a device is known, so a query by identifier of an
+        # older position returns nothing.
+        device_id = int(request.query.get("device_id") or request.query["deviceId"])
+        position = self.fleet.positions.get(device_id)
+
+        if position and "id" in request.query:
+            if position["id"] != int(request.query["id"]):
+                position = None
+
+        return web.json_response([position] if position else [])
+
+    async def _get_trips(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            self.fleet.trips_between(
+                int(request.query["deviceId"]),
+                datetime.fromisoformat(request.query["from"].replace("Z", "+00:00")),
+                datetime.fromisoformat(request.query["to"].replace("Z", "+00:00")),
+            )
+        )
+
+    async def _post_session(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "administrator": False,
+                "attributes": {},
+                "deviceLimit": -1,
+                "deviceReadonly": False,
+                "disabled": False,
+                "email": "loadtest@example.com",
+                "id": 1,
+                "latitude": 0.0,
+                "limitCommands": False,
+                "longitude": 0.0,
+                "name": "Load test",
+                "readonly": False,
+                "token": "token",
+                "twelveHourFormat": False,
+                "userLimit": 0,
+                "zoom": 0,
+            }
+        )
+
+    async def _get_subscription(self, request: web.Request) -> web.Response:
+        subscription = self.fleet.subscriptions.get(request.match_info["unique_id"])
+
+        if subscription is None:
+            raise web.HTTPNotFound()
+
+        return web.json_response(subscription)
+
+    async def _post_arm(self, request: web.Request) -> web.Response:
+        self.fleet.set_guarded(request.match_info["unique_id"], True)
+        return web.Response()
+
+    async def _post_disarm(self, request: web.Request) -> web.Response:
+        self.fleet.set_guarded(request.match_info["unique_id"], False)
+        return web.Response()
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        """Push position updates of random devices, until disconnected.
+
+        Like Traccar, each update consists of a message with the updated
+        device, followed by a message with its new position. Updates are
+        pushed on a fixed schedule, so time spent sending does not lower the
+        push rate.
+        """
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+
+        self.connects += 1
+        self._websockets.add(websocket)
+
+        start = next_push = time.monotonic()
+
+        try:
+            while not websocket.closed:
+                if (
+                    self.disconnect_after is not None
+                    and time.monotonic() - start >= self.disconnect_after
+                ):
+                    break
+
+                if not self.push_rate or not self.fleet.devices:
+                    await asyncio.sleep(0.1)
+                    next_push = time.monotonic()
+                    continue
+
+                # The push rate may change while waiting.
+                interval = 1.0 / self.push_rate
+
+                if (delay := next_push - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+
+                device_id = self.random.choice(self.fleet.device_ids)
+                position = self.fleet.move(device_id, datetime.now(timezone.utc))
+
+                await websocket.send_json({"devices": [self.fleet.devices[device_id]]})
+                await websocket.send_json({"positions": [position]})
+                self.pushed += 1
+
+                next_push += interval
+        finally:
+            self._websockets.discard(websocket)
+            await websocket.close()
+
+        return websocket
@@ -0,0 +1,114 @@
+"""Tests for the persistence of login tokens."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.biketrax.auth import TokenStore
+from custom_components.biketrax.const import (
+    DOMAIN,
+    STORAGE_KEY_TOKEN,
+    STORAGE_VERSION,
+)
+from custom_components.biketrax.registry import account_key
+
+KEY = STORAGE_KEY_TOKEN.format(account=account_key("test@example.com"))
+
+
+def _token_store(hass: HomeAssistant) -> TokenStore:
+    """Return the token store of an account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+    )
+
+    return TokenStore(hass, entry)
+
+
+def _account(id_token: dict[str, Any] | None = None) -> SimpleNamespace:
+    """Return an account that logs in with a new token."""
+    identity_api = SimpleNamespace(username="test@example.com", id_token=id_token)
+
+    async def _login() -> None:
+        identity_api.id_token = {"sub": "login", "exp": time.time() + 3600}
+
+    identity_api.login = _login
+
+    return SimpleNamespace(identity_api=identity_api)
+
+
+def _persist(hass_storage: dict[str, Any], id_token: Any) -> None:
+    """Persist a token."""
+    hass_storage[KEY] = {
+        "version": STORAGE_VERSION,
+        "key": KEY,
+        "data": {"id_token": id_token},
+    }
+
+
+async def test_restore(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that a valid persisted token is reused."""
+    id_token = {"sub": "persisted", "exp": time.time() + 3600}
+    _persist(hass_storage, id_token)
+    token_store = _token_store(hass)
+    account = _account()
+
+    assert await token_store.async_restore(account)
+    assert account.identity_api.id_token == id_token
+    assert token_store.reused == 1
+
+    # A login is not needed with the restored token.
+    token_store.async_attach(account)
+    await account.identity_api.login()
+
+    assert account.identity_api.id_token == id_token
+    assert token_store.logins == 0
+
+
+async def test_restore_expired(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that an expired or unreadable token is not reused."""
+    account = _account()
+
+    for id_token in ({"sub": "persisted", "exp": time.time() - 1}, "unreadable"):
+        _persist(hass_storage, id_token)
+        token_store = _token_store(hass)
+
+        assert not await token_store.async_restore(account)
+        assert account.identity_api.id_token is None
+        assert token_store.reused == 0
+
+    hass_storage.pop(KEY)
+
+    assert not await _token_store(hass).async_restore(account)
+
+
+async def test_login_saved(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that the token of a login is counted and persisted."""
+    token_store = _token_store(hass)
+    account = _account()
+
+    token_store.async_attach(account)
+    await account.identity_api.login()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert token_store.logins == 1
+    assert hass_storage[KEY]["data"] == {"id_token": account.identity_api.id_token}
+
+    await token_store.async_remove()
+
+    assert KEY not in hass_storage
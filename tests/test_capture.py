@@ -0,0 +1,80 @@
+"""Tests for the capture of API and push traffic."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from yarl import URL
+
+from custom_components.biketrax.capture import (
+    REDACTED,
+    TrafficRecorder,
+    request_key,
+)
+
+UNIQUE_ID = "123456789012345"
+
+
+def test_request_key() -> None:
+    """Test that volatile query parameters are left out of the key."""
+    assert request_key(
+        "GET", URL("https://example.com/api/positions?device_id=1&id=2")
+    ) == ("GET example.com/api/positions?device_id=1")
+
+
+def test_redact(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that personal data and tokens are not recorded."""
+    recorder = TrafficRecorder(hass, str(tmp_path / "capture.jsonl"))
+
+    redacted = recorder._redact(
+        {
+            "token": "secret",
+            "email": "test@example.com",
+            "attributes": {"passport": "P123", "phone": "+43123", "contact": None},
+            "positions": [{"latitude": 47.2692, "longitude": 11.4041}],
+            "uniqueId": UNIQUE_ID,
+            "name": "Bike",
+        }
+    )
+
+    assert redacted["token"] == REDACTED
+    assert redacted["email"] == REDACTED
+    assert redacted["attributes"] == {
+        "passport": REDACTED,
+        "phone": REDACTED,
+        "contact": None,
+    }
+    assert redacted["name"] == "Bike"
+
+    # Coordinates are shifted, within bounds.
+    position = redacted["positions"][0]
+
+    assert position["latitude"] != 47.2692
+    assert position["latitude"] == pytest.approx(47.2692, abs=recorder.MAX_OFFSET)
+
+    # Unique IDs are replaced consistently, also in the keys of requests.
+    pseudonym = redacted["uniqueId"]
+
+    assert pseudonym != UNIQUE_ID
+    assert len(pseudonym) == len(UNIQUE_ID)
+    assert recorder._redact({"uniqueId": UNIQUE_ID})["uniqueId"] == pseudonym
+    assert recorder._redact_key(f"GET example.com/admin/subscriptions/{UNIQUE_ID}") == (
+        f"GET example.com/admin/subscriptions/{pseudonym}"
+    )
+
+
+def test_rotate(
+    hass: HomeAssistant, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the file is rotated once it reaches its maximum size."""
+    monkeypatch.setattr(TrafficRecorder, "MAX_SIZE", 10)
+    path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(hass, str(path))
+
+    recorder._append(["first line"])
+    recorder._append(["second line"])
+
+    assert path.read_text() == "second line\n"
+    assert (tmp_path / "capture.jsonl.1").read_text() == "first line\n"
@@ -0,0 +1,199 @@
+"""Tests for the optimistic, debounced commands."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.components.alarm_control_panel.const import (
+    AlarmControlPanelState,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.biketrax.alarm_control_panel import BikeTraxAlarmController
+from custom_components.biketrax.command import OptimisticCommand
+
+COOLDOWN = 0.05
+
+
+class FakeCoordinator:
+    """Coordinator that only counts the commands."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.commands = 0
+        self.commands_coalesced = 0
+
+    def async_record_command(self, latency: float) -> None:
+        """Count a sent command."""
+        self.commands += 1
+
+
+class FakeDevice:
+    """Device setting that records the sent values."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize the setting, sending with a delay."""
+        self.delay = delay
+        self.sent: list[bool] = []
+        self.sending = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def async_send(self, value: bool) -> None:
+        """Send a value."""
+        self.sending.set()
+        await asyncio.sleep(self.delay)
+
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+
+        self.sent.append(value)
+
+
+@pytest.fixture(autouse=True)
+def short_cooldown(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Shorten the cooldown, to keep the tests fast."""
+    monkeypatch.setattr(OptimisticCommand, "COOLDOWN", COOLDOWN)
+
+
+async def test_coalesce(hass: HomeAssistant) -> None:
+    """Test that only the last value within the cooldown is sent."""
+    coordinator = FakeCoordinator(hass)
+    device = FakeDevice()
+    command = OptimisticCommand(coordinator, device.async_send, lambda: None)
+
+    await command.async_set(True)
+    await command.async_set(False)
+    await command.async_set(True)
+
+    assert command.desired is True
+
+    await asyncio.sleep(COOLDOWN * 4)
+
+    assert device.sent == [True]
+    assert command.desired is None
+    assert coordinator.commands == 1
+    assert coordinator.commands_coalesced == 2
+
+
+async def test_change_while_sending(hass: HomeAssistant) -> None:
+    """Test that a value that changes during a slow send is sent afterwards."""
+    coordinator = FakeCoordinator(hass)
+    device = FakeDevice(delay=COOLDOWN * 4)
+    command = OptimisticCommand(coordinator, device.async_send, lambda: None)
+
+    await command.async_set(True)
+    await asyncio.wait_for(device.sending.wait(), COOLDOWN * 10)
+
+    await command.async_set(False)
+
+    # The first send completes, and the changed value is sent after another
+    # cooldown.
+    await asyncio.sleep(COOLDOWN * 14)
+
+    assert device.sent == [True, False]
+    assert command.desired is None
+    assert coordinator.commands == 2
+
+    # The changed value did not replace a value that was waiting to be sent.
+    assert coordinator.commands_coalesced == 0
+
+
+async def test_rollback(hass: HomeAssistant) -> None:
+    """Test that the desired value is rolled back on any error."""
+    coordinator = FakeCoordinator(hass)
+    device = FakeDevice()
+    device.error = RuntimeError("Unexpected")
+    changes = []
+    rollbacks = []
+    command = OptimisticCommand(
+        coordinator,
+        device.async_send,
+        lambda: changes.append(command.desired),
+        lambda: rollbacks.append(command.desired),
+    )
+
+    await command.async_set(True)
+    await asyncio.sleep(COOLDOWN * 4)
+
+    assert device.sent == []
+    assert command.desired is None
+    assert changes == [True, None]
+    assert rollbacks == [None]
+    assert coordinator.commands == 0
+
+
+async def test_rollback_newer(hass: HomeAssistant) -> None:
+    """Test that a value that changed while sending is not rolled back."""
+    coordinator = FakeCoordinator(hass)
+    device = FakeDevice(delay=COOLDOWN * 4)
+    device.error = RuntimeError("Unexpected")
+    rollbacks = []
+    command = OptimisticCommand(
+        coordinator, device.async_send, lambda: None, lambda: rollbacks.append(1)
+    )
+
+    await command.async_set(True)
+    await asyncio.wait_for(device.sending.wait(), COOLDOWN * 10)
+
+    await command.async_set(False)
+
+    assert command.desired is False
+
+    await asyncio.sleep(COOLDOWN * 14)
+
+    assert device.sent == [False]
+    assert command.desired is None
+    assert rollbacks == []
+    assert coordinator.commands == 1
+
+
+async def test_rollback_alarm(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that arming at home is rolled back together with the alarm."""
+    monkeypatch.setattr(BikeTraxAlarmController, "async_write_ha_state", lambda _: None)
+
+    sender = FakeDevice()
+    device = SimpleNamespace(
+        id=1000,
+        name="Bike",
+        unique_id="123456789012345",
+        firmware_version="3.1.4",
+        is_guarded=False,
+        is_alarm_triggered=False,
+        set_guarded=sender.async_send,
+    )
+    alarm = BikeTraxAlarmController(FakeCoordinator(hass), device, False)
+
+    await alarm.async_alarm_arm_away()
+    await asyncio.sleep(COOLDOWN * 4)
+
+    device.is_guarded = True
+    sender.error = RuntimeError("Unexpected")
+
+    await alarm.async_alarm_arm_home()
+
+    assert alarm.state == AlarmControlPanelState.ARMED_HOME
+
+    await asyncio.sleep(COOLDOWN * 4)
+
+    assert sender.sent == [True]
+    assert alarm.state == AlarmControlPanelState.ARMED_AWAY
+
+
+async def test_shutdown(hass: HomeAssistant) -> None:
+    """Test that a pending value is not sent after shutting down."""
+    coordinator = FakeCoordinator(hass)
+    device = FakeDevice()
+    command = OptimisticCommand(coordinator, device.async_send, lambda: None)
+
+    await command.async_set(True)
+    command.async_shutdown()
+
+    await asyncio.sleep(COOLDOWN * 4)
+
+    assert device.sent == []
@@ -0,0 +1,120 @@
+"""Tests for the BikeTrax config flow."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.biketrax.const import (
+    CONF_COALESCE_WINDOW,
+    DATA_DEVICE,
+    DOMAIN,
+)
+from custom_components.biketrax.registry import async_get_registry
+
+from .fleet import Fleet
+from .standin import StandInServer
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading of this custom integration."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow delayed writes of storage that are pending after unloading."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Allow the stand-in server to close its connections after the test."""
+    return True
+
+
+def _add_entry(hass: HomeAssistant, username: str) -> MockConfigEntry:
+    """Add a config entry of an account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: username, CONF_PASSWORD: "secret"},
+    )
+    entry.add_to_hass(hass)
+
+    return entry
+
+
+async def test_duplicate_account(hass: HomeAssistant) -> None:
+    """Test that an account that is already configured is refused."""
+    _add_entry(hass, "Test@example.com")
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+    )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_validated_account(hass: HomeAssistant) -> None:
+    """Test that the setup continues with the account validated by the flow."""
+    async with StandInServer(Fleet(1)) as server:
+        with server.patch_account():
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": config_entries.SOURCE_USER}
+            )
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"],
+                {CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+            )
+            await hass.async_block_till_done()
+
+            assert result["type"] == FlowResultType.CREATE_ENTRY
+
+            # The devices were only retrieved to validate the account.
+            assert server.requests["/api/devices"] == 1
+            assert not async_get_registry(hass)._validated
+
+            await hass.config_entries.async_unload(result["result"].entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_options_reload_account(hass: HomeAssistant) -> None:
+    """Test that changed options apply to an account shared by entries."""
+    async with StandInServer(Fleet(1)) as server:
+        with server.patch_account():
+            entries = [
+                _add_entry(hass, "test@example.com"),
+                _add_entry(hass, "TEST@example.com"),
+            ]
+
+            # Sets up all entries of the domain.
+            assert await hass.config_entries.async_setup(entries[0].entry_id)
+            await hass.async_block_till_done()
+
+            result = await hass.config_entries.options.async_init(entries[0].entry_id)
+            result = await hass.config_entries.options.async_configure(
+                result["flow_id"], {CONF_COALESCE_WINDOW: 0}
+            )
+            await hass.async_block_till_done()
+
+            assert result["type"] == FlowResultType.CREATE_ENTRY
+
+            coordinators = [
+                hass.data[DOMAIN][entry.entry_id][DATA_DEVICE] for entry in entries
+            ]
+
+            assert coordinators[0] is coordinators[1]
+            assert not coordinators[0]._coalesce_window
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
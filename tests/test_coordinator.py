@@ -0,0 +1,574 @@
+"""Tests for the BikeTrax data update coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import homeassistant.util.dt as dt_util
+import pytest
+from aiobiketrax import exceptions
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.biketrax.const import (
+    CONF_COALESCE_WINDOW,
+    DATA_DEVICE,
+    DATA_SUBSCRIPTION,
+    DATA_TRIP,
+    DOMAIN,
+    STORAGE_KEY_TRIPS,
+    STORAGE_VERSION,
+)
+from custom_components.biketrax.coordinator import (
+    SCAN_INTERVAL_SUBSCRIPTION,
+    DevicePollScheduler,
+    PushHealth,
+    SubscriptionDataUpdateCoordinator,
+    TheftTracker,
+)
+from custom_components.biketrax.latency import PATH_POLL, PATH_PUSH
+from custom_components.biketrax.registry import account_key
+from custom_components.biketrax.retry import STATE_OPEN, RetryPolicy
+
+from .benchmarks.fake import FakeAccount
+from .fleet import Fleet
+from .standin import StandInServer
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading of this custom integration."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow delayed writes of storage that are pending after unloading."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Allow the stand-in server to close its connections after the test."""
+    return True
+
+
+async def _async_setup_entry(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Set up the integration."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    return entry
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_update_partial_failure(hass: HomeAssistant) -> None:
+    """Test that a device that fails to update does not fail the others."""
+    fleet = Fleet(2)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+            failing, updated = coordinator.account.devices
+            calls: list[int] = []
+
+            async def _update(device: Any) -> None:
+                calls.append(device.id)
+
+                if device is failing:
+                    raise exceptions.BikeTraxError("Unexpected")
+
+            errors = await coordinator._async_update_devices(
+                [failing, updated], _update
+            )
+
+            assert set(calls) == {failing.id, updated.id}
+            assert errors.keys() == {failing.id}
+
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_devices([failing], _update)
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_trip_cursor(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test that only trips newer than the persisted cursor are retrieved."""
+    fleet = Fleet(2)
+    resumed, new = fleet.device_ids
+    cursor = fleet.now - timedelta(hours=36)
+    key = STORAGE_KEY_TRIPS.format(account=account_key("test@example.com"))
+
+    hass_storage[key] = {
+        "version": STORAGE_VERSION,
+        "key": key,
+        "data": {str(resumed): cursor.isoformat()},
+    }
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_TRIP]
+            devices = {device.id: device for device in coordinator.account.devices}
+
+            assert len(devices[resumed].trips) == 1
+            assert devices[resumed].trips[0].end_time > cursor
+            assert len(devices[new].trips) == len(fleet.trips[new])
+
+            # The cursors advanced to the newest trip of each device.
+            await hass.async_block_till_done()
+
+            assert hass_storage[key]["data"] == {
+                str(device.id): max(trip.end_time for trip in device.trips).isoformat()
+                for device in devices.values()
+            }
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_track_stolen_device(hass: HomeAssistant) -> None:
+    """Test that tracking retrieves the latest position of a stolen device."""
+    fleet = Fleet(2)
+    device_id = fleet.device_ids[0]
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+            fleet.devices[device_id]["attributes"]["stolen"] = True
+            await coordinator.async_refresh()
+
+            assert device_id in coordinator.theft_tracker.tracking
+
+            position = fleet.move(device_id)
+            await coordinator._async_track()
+
+            device = next(
+                device
+                for device in coordinator.account.devices
+                if device.id == device_id
+            )
+            assert device.latitude == position["latitude"]
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_track_keeps_probe(hass: HomeAssistant) -> None:
+    """Test that tracking does not take the probe of the retry policy."""
+    fleet = Fleet(1)
+    device_id = fleet.device_ids[0]
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+            fleet.devices[device_id]["attributes"]["stolen"] = True
+            await coordinator.async_refresh()
+
+            # The backoff passed, so the next request is the probe.
+            coordinator.retry_policy.state = STATE_OPEN
+            coordinator.retry_policy.retry_at = dt_util.utcnow()
+            requests = sum(server.requests.values())
+
+            await coordinator._async_track()
+
+            assert sum(server.requests.values()) == requests
+            assert coordinator.retry_policy.state == STATE_OPEN
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_retry_after_failure(hass: HomeAssistant) -> None:
+    """Test that a failed update is retried soon, not after the poll interval."""
+    fleet = Fleet(1)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_SUBSCRIPTION]
+
+            assert coordinator.update_interval >= coordinator.MIN_INTERVAL / 2
+
+            server.error_rate = 1.0
+            await coordinator.async_refresh()
+
+            assert not coordinator.last_update_success
+            assert coordinator.update_interval <= RetryPolicy.BASE_DELAY
+
+            server.error_rate = 0.0
+            await coordinator.async_refresh()
+
+            assert coordinator.last_update_success
+            assert coordinator.update_interval >= coordinator.MIN_INTERVAL / 2
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_subscription_expiry(hass: HomeAssistant) -> None:
+    """Test that subscriptions are updated more often as they expire."""
+    fleet = Fleet(2)
+    expiring, renewed = fleet.subscriptions.values()
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_SUBSCRIPTION]
+
+            renewed["trialEnd"] = (dt_util.utcnow() + timedelta(days=300)).isoformat()
+
+            for expiry, interval in (
+                (timedelta(days=10), timedelta(days=5)),
+                (timedelta(days=30), SubscriptionDataUpdateCoordinator.MAX_INTERVAL),
+                (timedelta(minutes=30), SubscriptionDataUpdateCoordinator.MIN_INTERVAL),
+                (timedelta(days=-1), SCAN_INTERVAL_SUBSCRIPTION),
+            ):
+                expiring["trialEnd"] = (dt_util.utcnow() + expiry).isoformat()
+                await coordinator.async_refresh()
+
+                assert abs(coordinator.poll_interval() - interval) < timedelta(
+                    minutes=1
+                )
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_retry_while_open(hass: HomeAssistant) -> None:
+    """Test that updates are scheduled for when the circuit allows a probe."""
+    fleet = Fleet(1)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+
+            server.error_rate = 1.0
+
+            for _ in range(RetryPolicy.FAILURE_THRESHOLD):
+                await coordinator.async_refresh()
+
+            assert coordinator.retry_policy.state == STATE_OPEN
+
+            # The circuit is shared, so refused updates wait for it as well.
+            for data in (DATA_DEVICE, DATA_TRIP):
+                coordinator = hass.data[DOMAIN][entry.entry_id][data]
+                retry_at = coordinator.retry_policy.retry_at
+
+                before = retry_at - dt_util.utcnow()
+                await coordinator.async_refresh()
+                after = retry_at - dt_util.utcnow()
+
+                assert after <= coordinator.update_interval <= before
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_push_compares_pushed_devices(hass: HomeAssistant) -> None:
+    """Test that a pushed update only compares the device it is for."""
+    fleet = Fleet(2)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+            pushed, other = coordinator.account.devices
+
+            for device in fleet.devices.values():
+                device["name"] = "Renamed"
+
+            await coordinator.account.update_devices()
+
+            assert coordinator._changed_devices(PATH_PUSH, [pushed]) == {pushed.id}
+            assert coordinator._changed_devices(PATH_POLL) == {other.id}
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_update_changed_listeners(hass: HomeAssistant) -> None:
+    """Test that only the listeners of changed devices are updated."""
+    fleet = Fleet(2)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+            changed, unchanged = fleet.device_ids
+            updated: list[int | None] = []
+
+            removes = [
+                coordinator.async_add_listener(
+                    lambda context=context: updated.append(context), context
+                )
+                for context in (None, changed, unchanged)
+            ]
+
+            coordinator.async_set_updated_data({changed})
+
+            assert updated == [None, changed]
+
+            # All listeners are updated if the availability changes.
+            updated.clear()
+            coordinator.last_update_success = False
+            coordinator.async_update_listeners()
+
+            assert set(updated) == {None, changed, unchanged}
+
+            for remove in removes:
+                remove()
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_push_coalesced(hass: HomeAssistant) -> None:
+    """Test that bursts of pushed updates notify each device once."""
+    fleet = Fleet(3)
+    moved, moved_twice, alarmed = fleet.device_ids
+    accounts: list[FakeAccount] = []
+
+    def _account(*args: Any) -> FakeAccount:
+        accounts.append(FakeAccount(fleet, *args))
+        return accounts[-1]
+
+    with patch("custom_components.biketrax.Account", _account):
+        entry = await _async_setup_entry(hass, {CONF_COALESCE_WINDOW: 1000})
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+    updated: list[int] = []
+
+    removes = [
+        coordinator.async_add_listener(
+            lambda device_id=device_id: updated.append(device_id), device_id
+        )
+        for device_id in fleet.device_ids
+    ]
+
+    async def _push(message: dict[str, Any]) -> None:
+        messages = coordinator.push_health.messages
+        accounts[0].traccar_api.push(message)
+
+        while coordinator.push_health.messages == messages:
+            await asyncio.sleep(0)
+
+    for minutes, device_id in enumerate((moved, moved_twice, moved_twice), 1):
+        await _push(
+            {
+                "positions": [
+                    fleet.move(device_id, fleet.now + timedelta(minutes=minutes))
+                ]
+            }
+        )
+
+    assert not updated
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert sorted(updated) == [moved, moved_twice]
+
+    # A triggered alarm is not delayed.
+    updated.clear()
+    fleet.devices[alarmed]["attributes"]["alarm"] = True
+    await _push({"devices": [fleet.devices[alarmed]]})
+
+    assert updated == [alarmed]
+
+    for remove in removes:
+        remove()
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_unchanged_not_written(hass: HomeAssistant) -> None:
+    """Test that entities are not written if their state did not change."""
+    fleet = Fleet(1)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = await _async_setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+            state_writes = coordinator.state_writes
+
+            # The first update after the entities were added.
+            coordinator.async_set_updated_data(set(fleet.device_ids))
+
+            assert coordinator.state_writes == state_writes
+            assert coordinator.suppressed_writes > 0
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+def _device(device_id: int = 1000, **kwargs: Any) -> SimpleNamespace:
+    """Return an idle device, updated an hour ago."""
+    return SimpleNamespace(
+        **{
+            "id": device_id,
+            "is_stolen": False,
+            "is_alarm_triggered": False,
+            "speed": 0.0,
+            "status": "online",
+            "last_updated": dt_util.utcnow() - timedelta(hours=1),
+            **kwargs,
+        }
+    )
+
+
+def test_theft_tracker() -> None:
+    """Test that stolen and alarmed devices are tracked."""
+    tracker = TheftTracker()
+
+    tracker.update(
+        [
+            _device(1000),
+            _device(1001, is_stolen=True),
+            _device(1002, is_alarm_triggered=True),
+        ]
+    )
+
+    assert tracker.tracking.keys() == {1001, 1002}
+
+    tracker.update([_device(1000), _device(1001), _device(1002)])
+
+    assert not tracker.tracking
+
+
+def test_theft_tracker_limit() -> None:
+    """Test that a limited number of devices is tracked at once."""
+    tracker = TheftTracker()
+
+    tracker.update(
+        [
+            _device(device_id, is_stolen=True)
+            for device_id in range(1000, 1000 + TheftTracker.MAX_DEVICES + 1)
+        ]
+    )
+
+    assert len(tracker.tracking) == TheftTracker.MAX_DEVICES
+
+
+def test_theft_tracker_expires(freezer: FrozenDateTimeFactory) -> None:
+    """Test that tracking stops after a while, until stolen again."""
+    tracker = TheftTracker()
+
+    tracker.update([_device(is_stolen=True)])
+    freezer.tick(TheftTracker.DURATION)
+    tracker.update([_device(is_stolen=True)])
+
+    assert not tracker.tracking
+
+    tracker.update([_device()])
+    tracker.update([_device(is_stolen=True)])
+
+    assert tracker.tracking.keys() == {1000}
+
+
+@pytest.mark.usefixtures("freezer")
+def test_poll_interval() -> None:
+    """Test the poll interval of devices, based on their activity."""
+    scheduler = DevicePollScheduler(timedelta(minutes=1), timedelta(minutes=15))
+
+    assert scheduler.interval(_device(is_alarm_triggered=True)) == timedelta(minutes=1)
+    assert scheduler.interval(_device(speed=10.0)) == timedelta(minutes=1)
+    assert scheduler.interval(_device(status="offline")) == timedelta(minutes=15)
+    assert scheduler.interval(_device(last_updated=None)) == timedelta(minutes=15)
+
+    # Idle devices are polled less frequently the longer they are idle.
+    assert scheduler.interval(
+        _device(last_updated=dt_util.utcnow() - timedelta(minutes=20))
+    ) == timedelta(minutes=5)
+    assert scheduler.interval(_device()) == timedelta(minutes=15)
+    assert scheduler.interval(_device(last_updated=dt_util.utcnow())) == timedelta(
+        minutes=1
+    )
+
+
+def test_poll_interval_stretch() -> None:
+    """Test that the poll interval of devices is stretched, unless alarmed."""
+    scheduler = DevicePollScheduler(timedelta(minutes=1), timedelta(minutes=15))
+
+    assert scheduler.interval(_device(speed=10.0), 4.0) == timedelta(minutes=4)
+    assert scheduler.interval(_device(), 4.0) == timedelta(minutes=15)
+    assert scheduler.interval(_device(is_alarm_triggered=True), 4.0) == timedelta(
+        minutes=1
+    )
+
+
+def test_poll_schedule() -> None:
+    """Test that devices are polled at the shortest interval of any device."""
+    scheduler = DevicePollScheduler(timedelta(minutes=1), timedelta(minutes=15))
+
+    assert scheduler.schedule([]) == timedelta(minutes=15)
+    assert scheduler.schedule([_device(1000), _device(1001, speed=10.0)]) == (
+        timedelta(minutes=1)
+    )
+
+
+def test_poll_maximum() -> None:
+    """Test that the maximum interval is at least the minimum interval."""
+    scheduler = DevicePollScheduler(timedelta(minutes=15), timedelta(minutes=1))
+
+    assert scheduler.max_interval == timedelta(minutes=15)
+
+
+def test_push_health(freezer: FrozenDateTimeFactory) -> None:
+    """Test that the push channel is healthy while connected and busy."""
+    health = PushHealth()
+
+    assert not health.healthy
+    assert health.stretch == 1.0
+
+    health.connected = True
+    health.message_received()
+
+    assert health.healthy
+    assert health.stretch == PushHealth.STRETCH
+    assert health.messages == 1
+
+    freezer.tick(PushHealth.QUIET_TIMEOUT)
+
+    assert not health.healthy
+
+
+async def test_push_health_connects() -> None:
+    """Test that opening the websocket registers a connect."""
+    health = PushHealth()
+    trace_config = health.trace_config()
+
+    for status in (200, 101, 101):
+        for handler in trace_config.on_request_end:
+            await handler(
+                None,
+                SimpleNamespace(),
+                SimpleNamespace(response=SimpleNamespace(status=status)),
+            )
+
+    assert health.connected
+    assert health.connects == 2
+    assert health.reconnects == 1
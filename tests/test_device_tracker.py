@@ -0,0 +1,185 @@
+"""Tests for the BikeTrax device tracker."""
+
+from __future__ import annotations
+
+import math
+from datetime import timedelta
+from types import SimpleNamespace
+
+import homeassistant.util.dt as dt_util
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.biketrax.device_tracker import (
+    EARTH_RADIUS,
+    MAX_LOCATION_AGE,
+    BikeTraxDeviceTracker,
+    haversine,
+)
+
+LATITUDE = 47.2692
+LONGITUDE = 11.4041
+
+# Distance (in degrees of latitude) of roughly one meter.
+METER = 1 / 111195
+
+
+def test_haversine() -> None:
+    """Test the distance between two locations."""
+    assert haversine(LATITUDE, LONGITUDE, LATITUDE, LONGITUDE) == 0.0
+
+    # One degree of latitude is about 111 km anywhere.
+    assert haversine(0.0, 0.0, 1.0, 0.0) == pytest.approx(111195, rel=1e-3)
+    assert haversine(LATITUDE, LONGITUDE, LATITUDE + 1.0, LONGITUDE) == (
+        pytest.approx(111195, rel=1e-3)
+    )
+
+    # From the equator to the pole is a quarter of the circumference.
+    assert haversine(0.0, 0.0, 90.0, LONGITUDE) == pytest.approx(
+        math.pi / 2 * EARTH_RADIUS
+    )
+
+
+def _tracker(ignore_jitter: bool = True) -> BikeTraxDeviceTracker:
+    """Return a tracker of a device at a fixed location."""
+    coordinator = SimpleNamespace(ignore_jitter=ignore_jitter, suppressed_jitter=0)
+    device = SimpleNamespace(
+        id=1000,
+        name="Bike",
+        unique_id="123456789012345",
+        firmware_version="3.1.4",
+        is_tracking_enabled=True,
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        accuracy=20,
+        altitude=574.0,
+        course=90.0,
+        speed=0.0,
+        fix_time=dt_util.utcnow(),
+    )
+
+    tracker = BikeTraxDeviceTracker(coordinator, device)
+    tracker._update_location()
+
+    return tracker
+
+
+def _move(tracker: BikeTraxDeviceTracker, meters: float, accuracy: int = 20) -> None:
+    """Report a new fix of the device further north, and update the tracker."""
+    tracker.device.latitude += meters * METER
+    tracker.device.accuracy = accuracy
+    tracker.device.altitude += 1.0
+    tracker.device.speed += 1.0
+    tracker.device.fix_time += timedelta(minutes=1)
+    tracker._update_location()
+
+
+def test_jitter_suppressed() -> None:
+    """Test that moves within the accuracy are suppressed."""
+    tracker = _tracker()
+
+    _move(tracker, 15)
+
+    assert tracker.latitude == LATITUDE
+    assert tracker.coordinator.suppressed_jitter == 1
+
+
+def test_jitter_counted_once() -> None:
+    """Test that a suppressed fix is counted once, however often it updates."""
+    tracker = _tracker()
+
+    _move(tracker, 15)
+    tracker._update_location()
+    tracker._update_location()
+
+    assert tracker.coordinator.suppressed_jitter == 1
+
+
+def test_jitter_attributes() -> None:
+    """Test that the attributes of a suppressed fix are not reported."""
+    tracker = _tracker()
+    attributes = tracker.extra_state_attributes
+
+    _move(tracker, 15)
+
+    assert tracker.extra_state_attributes == attributes
+
+    _move(tracker, 50)
+
+    assert tracker.extra_state_attributes == {
+        "altitude": tracker.device.altitude,
+        "course": tracker.device.course,
+        "speed": tracker.device.speed,
+        "fix_time": tracker.device.fix_time,
+    }
+
+
+def test_same_location() -> None:
+    """Test that a new fix at the same location keeps the attributes."""
+    tracker = _tracker(ignore_jitter=False)
+    attributes = tracker.extra_state_attributes
+
+    _move(tracker, 0)
+
+    assert tracker.extra_state_attributes == attributes
+    assert tracker.coordinator.suppressed_jitter == 0
+
+
+def test_same_location_old(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a new fix at the same location updates an old location."""
+    tracker = _tracker(ignore_jitter=False)
+
+    freezer.tick(MAX_LOCATION_AGE + timedelta(seconds=1))
+    _move(tracker, 0)
+
+    assert tracker.extra_state_attributes["fix_time"] == tracker.device.fix_time
+
+
+def test_tracking_disabled() -> None:
+    """Test that no location or attributes are reported without tracking."""
+    tracker = _tracker()
+
+    tracker.device.is_tracking_enabled = False
+    tracker._update_location()
+
+    assert tracker.latitude is None
+    assert tracker.extra_state_attributes == {}
+
+
+def test_jitter_moved() -> None:
+    """Test that moves beyond the accuracy update the location."""
+    tracker = _tracker()
+
+    _move(tracker, 50)
+
+    assert tracker.latitude == tracker.device.latitude
+    assert tracker.coordinator.suppressed_jitter == 0
+
+
+def test_jitter_new_accuracy() -> None:
+    """Test that the accuracy of the new location is taken into account."""
+    tracker = _tracker()
+
+    _move(tracker, 50, accuracy=100)
+
+    assert tracker.latitude == LATITUDE
+
+
+def test_jitter_old_location(freezer: FrozenDateTimeFactory) -> None:
+    """Test that an old location is updated, even within the accuracy."""
+    tracker = _tracker()
+
+    freezer.tick(MAX_LOCATION_AGE + timedelta(seconds=1))
+    _move(tracker, 15)
+
+    assert tracker.latitude == tracker.device.latitude
+
+
+def test_jitter_not_ignored() -> None:
+    """Test that all moves update the location, unless jitter is ignored."""
+    tracker = _tracker(ignore_jitter=False)
+
+    _move(tracker, 1)
+
+    assert tracker.latitude == tracker.device.latitude
+    assert tracker.coordinator.suppressed_jitter == 0
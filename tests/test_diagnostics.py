@@ -0,0 +1,72 @@
+"""Tests for the BikeTrax diagnostics."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.biketrax.const import DOMAIN
+from custom_components.biketrax.diagnostics import async_get_config_entry_diagnostics
+
+from .fleet import Fleet
+from .standin import StandInServer
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading of this custom integration."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow delayed writes of storage that are pending after unloading."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Allow the stand-in server to close its connections after the test."""
+    return True
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_redacted(hass: HomeAssistant) -> None:
+    """Test that the credentials and device identifiers are redacted."""
+    fleet = Fleet(2)
+
+    async with StandInServer(fleet) as server:
+        with server.patch_account():
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+            )
+            entry.add_to_hass(hass)
+
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+            diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+            assert diagnostics["entry"]["data"] == {
+                CONF_USERNAME: REDACTED,
+                CONF_PASSWORD: REDACTED,
+            }
+            assert [device["uniqueId"] for device in diagnostics["devices"]] == [
+                REDACTED,
+                REDACTED,
+            ]
+
+            # The redacted values do not appear anywhere else.
+            dump = str(diagnostics)
+
+            for value in (
+                "test@example.com",
+                "secret",
+                *(device["uniqueId"] for device in fleet.devices.values()),
+            ):
+                assert value not in dump
+
+            await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,72 @@
+"""Tests for the latency measurement."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.biketrax.latency import (
+    PATH_POLL,
+    PATH_PUSH,
+    STAGE_RECEIVE,
+    LatencyTracker,
+    LatencyWindow,
+)
+
+
+def test_empty_window() -> None:
+    """Test that an empty window has no percentiles."""
+    window = LatencyWindow()
+
+    assert window.p50 is None
+    assert window.p95 is None
+    assert window.max is None
+
+
+def test_percentiles() -> None:
+    """Test the percentiles of a window."""
+    window = LatencyWindow()
+
+    for latency in range(101):
+        window.add(float(latency))
+
+    assert window.p50 == 50.0
+    assert window.p95 == 95.0
+    assert window.max == 100.0
+    assert window.percentile(0) == 0.0
+
+
+def test_window_size() -> None:
+    """Test that only the most recent samples are kept."""
+    window = LatencyWindow()
+
+    for latency in range(LatencyWindow.SIZE * 2):
+        window.add(float(latency))
+
+    assert window.percentile(0) == LatencyWindow.SIZE
+    assert window.max == LatencyWindow.SIZE * 2 - 1
+
+
+def test_tracker(freezer: FrozenDateTimeFactory) -> None:
+    """Test that the latency is recorded per stage and path."""
+    tracker = LatencyTracker()
+    last_updated = dt_util.utcnow()
+
+    freezer.tick(timedelta(seconds=5))
+
+    tracker.record(STAGE_RECEIVE, PATH_PUSH, last_updated)
+    tracker.record(STAGE_RECEIVE, PATH_PUSH, None)
+
+    assert tracker.windows[STAGE_RECEIVE, PATH_PUSH].max == 5.0
+    assert tracker.windows[STAGE_RECEIVE, PATH_POLL].max is None
+
+
+def test_tracker_clock_skew() -> None:
+    """Test that an update time in the future does not give a negative latency."""
+    tracker = LatencyTracker()
+
+    tracker.record(STAGE_RECEIVE, PATH_POLL, dt_util.utcnow() + timedelta(seconds=5))
+
+    assert tracker.windows[STAGE_RECEIVE, PATH_POLL].max == 0.0
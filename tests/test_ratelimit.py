@@ -0,0 +1,127 @@
+"""Tests for the rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.biketrax.ratelimit import (
+    _PRIORITY,
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_DEVICE,
+    RateLimiter,
+    request_priority,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hand out tokens quickly, with a small burst, to keep the tests fast."""
+    monkeypatch.setattr(RateLimiter, "RATE", 100.0)
+    monkeypatch.setattr(RateLimiter, "CAPACITY", 2)
+
+
+async def test_burst() -> None:
+    """Test that requests within the capacity do not wait."""
+    limiter = RateLimiter()
+
+    for _ in range(RateLimiter.CAPACITY):
+        await limiter.acquire(PRIORITY_BACKGROUND)
+
+    assert limiter.requests == RateLimiter.CAPACITY
+    assert limiter.waited == 0
+    assert limiter.queue_depth == 0
+
+
+async def test_wait() -> None:
+    """Test that requests beyond the capacity wait for a token."""
+    limiter = RateLimiter()
+
+    for _ in range(RateLimiter.CAPACITY + 1):
+        await limiter.acquire(PRIORITY_BACKGROUND)
+
+    assert limiter.waited == 1
+    assert limiter.max_wait > 0.0
+    assert limiter.average_wait > 0.0
+
+
+async def test_priority() -> None:
+    """Test that waiting requests are served in order of priority."""
+    limiter = RateLimiter()
+    served: list[int] = []
+
+    for _ in range(RateLimiter.CAPACITY):
+        await limiter.acquire(PRIORITY_BACKGROUND)
+
+    async def _acquire(priority: int) -> None:
+        await limiter.acquire(priority)
+        served.append(priority)
+
+    tasks = [
+        asyncio.create_task(_acquire(priority))
+        for priority in (PRIORITY_BACKGROUND, PRIORITY_DEVICE, PRIORITY_COMMAND)
+    ]
+    await asyncio.sleep(0)
+
+    assert limiter.queue_depth == 3
+
+    await asyncio.gather(*tasks)
+
+    assert limiter.queue_depth == 0
+    assert limiter.max_queue_depth == 3
+
+    assert served == [PRIORITY_COMMAND, PRIORITY_DEVICE, PRIORITY_BACKGROUND]
+
+
+async def test_cancelled_waiter() -> None:
+    """Test that a cancelled request does not take a token."""
+    limiter = RateLimiter()
+
+    for _ in range(RateLimiter.CAPACITY):
+        await limiter.acquire(PRIORITY_BACKGROUND)
+
+    cancelled = asyncio.create_task(limiter.acquire(PRIORITY_COMMAND))
+    waiting = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+
+    assert limiter.queue_depth == 1
+
+    await asyncio.wait_for(waiting, 1.0)
+
+    assert limiter.queue_depth == 0
+
+
+async def test_login() -> None:
+    """Test that only logins that are made take a token."""
+    limiter = RateLimiter()
+    logins: list[int] = []
+
+    async def _login() -> None:
+        logins.append(limiter.requests)
+
+    identity_api = SimpleNamespace(id_token={"sub": "test"}, login=_login)
+    limiter.attach_login(SimpleNamespace(identity_api=identity_api))
+
+    await identity_api.login()
+
+    assert limiter.requests == 0
+
+    identity_api.id_token = None
+    await identity_api.login()
+
+    assert logins == [0, 1]
+
+
+def test_request_priority() -> None:
+    """Test that the priority applies within the context only."""
+    assert _PRIORITY.get() == PRIORITY_BACKGROUND
+
+    with request_priority(PRIORITY_COMMAND):
+        assert _PRIORITY.get() == PRIORITY_COMMAND
+
+    assert _PRIORITY.get() == PRIORITY_BACKGROUND
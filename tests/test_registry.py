@@ -0,0 +1,116 @@
+"""Tests for the registry of shared accounts."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.biketrax.const import DATA_DEVICE, DOMAIN
+from custom_components.biketrax.registry import (
+    AccountRegistry,
+    account_key,
+    async_get_registry,
+)
+
+from .fleet import Fleet
+from .standin import StandInServer
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading of this custom integration."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow delayed writes of storage that are pending after unloading."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Allow the stand-in server to close its connections after the test."""
+    return True
+
+
+def test_account_key() -> None:
+    """Test that the key of an account does not depend on the case."""
+    assert account_key("Test@example.com") == account_key("test@example.com")
+    assert account_key("test@example.com") != account_key("other@example.com")
+    assert "test" not in account_key("test@example.com")
+
+
+async def test_pop_validated(hass: HomeAssistant) -> None:
+    """Test that a validated account is handed over once, if it matches."""
+    registry = async_get_registry(hass)
+    account = SimpleNamespace(
+        identity_api=SimpleNamespace(username="Test@example.com", password="secret")
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "secret"},
+    )
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "changed"},
+    )
+
+    registry.async_add_validated(account)
+
+    assert registry.async_pop_validated(entry) is account
+    assert registry.async_pop_validated(entry) is None
+
+    registry.async_add_validated(account)
+
+    assert registry.async_pop_validated(other) is None
+    assert registry.async_pop_validated(entry) is None
+
+    registry._validated["test@example.com"] = (
+        time.monotonic() - AccountRegistry.VALIDATED_TIMEOUT - 1,
+        account,
+    )
+
+    assert registry.async_pop_validated(entry) is None
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_shared_until_released(hass: HomeAssistant) -> None:
+    """Test that entries share an account until the last one is released."""
+    async with StandInServer(Fleet(1)) as server:
+        with server.patch_account():
+            entries = [
+                MockConfigEntry(
+                    domain=DOMAIN,
+                    data={CONF_USERNAME: username, CONF_PASSWORD: "secret"},
+                )
+                for username in ("test@example.com", "TEST@example.com")
+            ]
+
+            for entry in entries:
+                entry.add_to_hass(hass)
+
+            # Sets up all entries of the domain.
+            assert await hass.config_entries.async_setup(entries[0].entry_id)
+            await hass.async_block_till_done()
+
+            coordinator = hass.data[DOMAIN][entries[0].entry_id][DATA_DEVICE]
+
+            assert hass.data[DOMAIN][entries[1].entry_id][DATA_DEVICE] is coordinator
+            assert len(async_get_registry(hass)._accounts) == 1
+
+            # The entry that created the account is released first.
+            await hass.config_entries.async_unload(entries[0].entry_id)
+
+            assert coordinator._push_started
+            assert coordinator.account._update_task is not None
+
+            await hass.config_entries.async_unload(entries[1].entry_id)
+
+            assert not coordinator._push_started
+            assert coordinator.account._update_task is None
+            assert not async_get_registry(hass)._accounts
@@ -0,0 +1,137 @@
+"""Tests for the retry policy."""
+
+from __future__ import annotations
+
+import homeassistant.util.dt as dt_util
+from freezegun.api import FrozenDateTimeFactory
+
+from custom_components.biketrax.retry import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    RetryPolicy,
+)
+
+
+def _open(policy: RetryPolicy) -> None:
+    """Fail requests until the circuit opens."""
+    for _ in range(RetryPolicy.FAILURE_THRESHOLD):
+        policy.record_failure()
+
+
+def test_closed() -> None:
+    """Test that requests are allowed until the failure threshold is reached."""
+    policy = RetryPolicy()
+
+    for _ in range(RetryPolicy.FAILURE_THRESHOLD - 1):
+        policy.record_failure()
+        assert policy.allow_request()
+
+    assert policy.state == STATE_CLOSED
+
+    policy.record_failure()
+
+    assert policy.state == STATE_OPEN
+    assert not policy.allow_request()
+
+
+def test_success_resets_failures() -> None:
+    """Test that a success resets the consecutive failures."""
+    policy = RetryPolicy()
+
+    for _ in range(RetryPolicy.FAILURE_THRESHOLD - 1):
+        policy.record_failure()
+
+    policy.record_success()
+    policy.record_failure()
+
+    assert policy.failures == 1
+    assert policy.state == STATE_CLOSED
+
+
+def test_probe(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a single probe is allowed once the backoff expired."""
+    policy = RetryPolicy()
+    _open(policy)
+
+    freezer.tick(RetryPolicy.MAX_DELAY)
+
+    assert policy.allow_request()
+    assert policy.state == STATE_HALF_OPEN
+    assert not policy.allow_request()
+
+    policy.record_success()
+
+    assert policy.state == STATE_CLOSED
+    assert policy.failures == 0
+    assert policy.allow_request()
+
+
+def test_probe_fails(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a failed probe re-opens the circuit with a longer backoff."""
+    policy = RetryPolicy()
+    _open(policy)
+
+    freezer.tick(RetryPolicy.MAX_DELAY)
+
+    assert policy.allow_request()
+
+    policy.record_failure()
+
+    assert policy.state == STATE_OPEN
+    assert not policy.allow_request()
+
+
+def test_probe_cancelled(freezer: FrozenDateTimeFactory) -> None:
+    """Test that a cancelled probe allows another probe."""
+    policy = RetryPolicy()
+    _open(policy)
+
+    freezer.tick(RetryPolicy.MAX_DELAY)
+
+    assert policy.allow_request()
+
+    policy.record_cancelled()
+
+    assert policy.state == STATE_OPEN
+    assert policy.allow_request()
+
+
+def test_cancelled_while_closed() -> None:
+    """Test that a cancelled request does not affect a closed circuit."""
+    policy = RetryPolicy()
+    policy.record_cancelled()
+
+    assert policy.state == STATE_CLOSED
+    assert policy.failures == 0
+
+
+def test_backoff() -> None:
+    """Test that the backoff doubles, within the maximum delay."""
+    policy = RetryPolicy()
+
+    policy.failures = RetryPolicy.FAILURE_THRESHOLD
+    assert RetryPolicy.BASE_DELAY / 2 <= policy.backoff() <= RetryPolicy.BASE_DELAY
+
+    policy.failures += 1
+    assert RetryPolicy.BASE_DELAY <= policy.backoff() <= RetryPolicy.BASE_DELAY * 2
+
+    policy.failures = 100
+    assert policy.backoff() <= RetryPolicy.MAX_DELAY
+    assert policy.backoff() >= RetryPolicy.MAX_DELAY / 2
+
+
+def test_retry_delay(freezer: FrozenDateTimeFactory) -> None:
+    """Test the time until requests are allowed again."""
+    policy = RetryPolicy()
+
+    assert policy.retry_delay() is None
+
+    _open(policy)
+
+    assert policy.retry_delay() == policy.retry_at - dt_util.utcnow()
+
+    freezer.move_to(policy.retry_at)
+    policy.allow_request()
+
+    assert policy.retry_delay() == RetryPolicy.BASE_DELAY
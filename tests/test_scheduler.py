@@ -0,0 +1,69 @@
+"""Tests for the domain-wide scheduler."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from custom_components.biketrax.registry import account_key
+from custom_components.biketrax.scheduler import DomainScheduler, async_get_scheduler
+
+INTERVAL = timedelta(minutes=15)
+
+
+def test_offset() -> None:
+    """Test that the offset is stable, and differs between accounts."""
+    key = account_key("one@example.com")
+
+    assert DomainScheduler.offset(key) == DomainScheduler.offset(key)
+    assert 0.0 <= DomainScheduler.offset(key) < 1.0
+    assert DomainScheduler.offset(key) != DomainScheduler.offset(
+        account_key("two@example.com")
+    )
+
+
+@pytest.mark.parametrize("seconds", (0, 100, 450, 899))
+def test_align(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: int
+) -> None:
+    """Test that updates are aligned to the slot of an account."""
+    scheduler = DomainScheduler(hass)
+    key = account_key("one@example.com")
+    period = INTERVAL.total_seconds()
+
+    freezer.tick(timedelta(seconds=seconds))
+
+    delay = scheduler.align(key, INTERVAL)
+    slot = (dt_util.utcnow().timestamp() + delay.total_seconds()) % period
+
+    assert INTERVAL / 2 <= delay < INTERVAL * 1.5
+    assert slot == pytest.approx(scheduler.offset(key) * period, abs=1e-3)
+
+
+@pytest.mark.parametrize("seconds", (0, 100, 450, 899))
+def test_align_maximum(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: int
+) -> None:
+    """Test that aligned updates are never later than the maximum."""
+    scheduler = DomainScheduler(hass)
+    key = account_key("one@example.com")
+
+    freezer.tick(timedelta(seconds=seconds))
+
+    assert scheduler.align(key, INTERVAL, INTERVAL) <= INTERVAL
+
+
+def test_align_without_interval(hass: HomeAssistant) -> None:
+    """Test that an empty interval is returned as is."""
+    scheduler = DomainScheduler(hass)
+
+    assert scheduler.align("key", timedelta()) == timedelta()
+
+
+async def test_get_scheduler(hass: HomeAssistant) -> None:
+    """Test that the scheduler is shared by the domain."""
+    assert async_get_scheduler(hass) is async_get_scheduler(hass)
@@ -0,0 +1,85 @@
+"""Tests for the snapshots of account data."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from aiobiketrax import models
+
+from custom_components.biketrax.snapshot import (
+    SNAPSHOT_VERSION,
+    create_snapshot,
+    restore_snapshot,
+)
+
+from .fleet import Fleet
+
+
+def _account(fleet: Fleet) -> SimpleNamespace:
+    """Return an account with the data of a fleet, as the account parses it."""
+    devices = {
+        device_id: models.Device.from_dict(device)
+        for device_id, device in fleet.devices.items()
+    }
+
+    return SimpleNamespace(
+        _devices=devices,
+        _positions={
+            device_id: models.Position.from_dict(position)
+            for device_id, position in fleet.positions.items()
+        },
+        _subscriptions={
+            device_id: models.Subscription.from_dict(
+                fleet.subscriptions[device.unique_id]
+            )
+            for device_id, device in devices.items()
+        },
+    )
+
+
+def test_round_trip() -> None:
+    """Test that a restored snapshot equals the original data."""
+    account = _account(Fleet(3))
+
+    # Snapshots are persisted as JSON.
+    snapshot = json.loads(json.dumps(create_snapshot(account)))
+
+    assert snapshot["version"] == SNAPSHOT_VERSION
+
+    restored = SimpleNamespace(_devices={}, _positions={}, _subscriptions={})
+    restore_snapshot(restored, snapshot)
+
+    assert restored._devices == account._devices
+    assert restored._positions == account._positions
+    assert restored._subscriptions == account._subscriptions
+
+
+def test_missing_data() -> None:
+    """Test that devices without position or subscription are left out."""
+    account = _account(Fleet(2))
+    device_id = next(iter(account._devices))
+
+    account._positions[device_id] = None
+    account._subscriptions[device_id] = None
+
+    snapshot = create_snapshot(account)
+
+    assert len(snapshot["devices"]) == 2
+    assert len(snapshot["positions"]) == 1
+    assert str(device_id) not in snapshot["subscriptions"]
+
+
+def test_invalid_snapshot() -> None:
+    """Test that an invalid snapshot leaves the account untouched."""
+    account = _account(Fleet(1))
+    devices = account._devices
+
+    snapshot = create_snapshot(account)
+    snapshot["positions"] = [{"invalid": True}]
+
+    with pytest.raises((AssertionError, KeyError, TypeError, ValueError)):
+        restore_snapshot(account, snapshot)
+
+    assert account._devices is devices